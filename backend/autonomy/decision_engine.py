@@ -14,8 +14,10 @@ Date: 2025-11-22
 """
 
 import time
-from typing import Dict, Optional, Tuple, List
+from typing import Deque, Dict, Optional, Tuple, List
 from dataclasses import dataclass, field
+from collections import deque
+from itertools import islice
 import threading
 from enum import Enum
 
@@ -82,8 +84,8 @@ class DecisionEngine:
         )
 
         # Histórico de decisões
-        self.decision_history: List[Decision] = []
         self.max_history = 1000
+        self.decision_history: Deque[Decision] = deque(maxlen=self.max_history)
 
         # Thread de decisão autônoma
         self._decision_thread: Optional[threading.Thread] = None
@@ -122,7 +124,8 @@ class DecisionEngine:
             self._decision_thread.join(timeout=2.0)
 
     def _autonomous_decision_loop(self):
-        """Loop principal de decisão autônoma"""
+        """Loop principal de decisão autônoma (prazo fixo, acorda no stop)"""
+        next_tick = time.monotonic()
         while not self._stop_decisions.is_set():
             try:
                 decision = self.make_decision()
@@ -140,7 +143,8 @@ class DecisionEngine:
             except Exception as e:
                 print(f"❌ Erro no loop de decisão: {e}")
 
-            time.sleep(self.decision_interval)
+            next_tick = max(next_tick + self.decision_interval, time.monotonic())
+            self._stop_decisions.wait(max(next_tick - time.monotonic(), 0.0))
 
     def make_decision(self) -> Decision:
         """
@@ -225,11 +229,67 @@ class DecisionEngine:
 
         # Adiciona ao histórico
         self.decision_history.append(decision)
-        if len(self.decision_history) > self.max_history:
-            self.decision_history.pop(0)
 
         return decision
 
+    def make_decisions(self, states: List[SystemState]) -> List[Decision]:
+        """
+        Toma decisões para uma sequência de estados observados (ex: replay
+        ou estados acumulados entre ciclos) em uma única passada
+
+        Orient roda em lote via KalmanPolicyPredictor.predict_batch; o
+        Decide aplica os mesmos filtros de make_decision a cada estado.
+
+        Args:
+            states: Estados do sistema, em ordem temporal
+
+        Returns:
+            Decisões na mesma ordem de states
+        """
+        if not states:
+            return []
+
+        start_time = time.time()
+        metrics = self.metrics_collector.get_snapshot()
+
+        # === ORIENT (lote) ===
+        actions, predictions = self.policy_predictor.predict_batch(
+            states,
+            target=self._get_target_from_mode()
+        )
+        orient_time = (time.time() - start_time) * 1000 / len(states)
+
+        # === DECIDE ===
+        decisions = []
+        for state, action, policy_prediction in zip(states, actions, predictions):
+            decide_start = time.time()
+            final_action, confidence, reasoning = self._apply_decision_filters(
+                action,
+                policy_prediction.confidence,
+                policy_prediction.reasoning,
+                state
+            )
+            decide_time = (time.time() - decide_start) * 1000
+
+            decisions.append(Decision(
+                action=final_action,
+                confidence=confidence,
+                reasoning=reasoning,
+                system_state=state,
+                predicted_state=policy_prediction.predicted_state,
+                metrics_snapshot=metrics,
+                mode=self.mode,
+                processing_time_ms=orient_time + decide_time,
+                orient_time_ms=orient_time,
+                decide_time_ms=decide_time
+            ))
+
+        # Adiciona ao histórico
+        self.decision_history.extend(decisions)
+        self._last_decision = decisions[-1]
+
+        return decisions
+
     def _get_target_from_mode(self) -> str:
         """Retorna target baseado no modo de operação"""
         if self.mode == DecisionMode.CONSERVATIVE:
@@ -298,14 +358,16 @@ class DecisionEngine:
 
     def get_decision_history(self, limit: int = 100) -> List[Decision]:
         """Retorna histórico de decisões"""
-        return self.decision_history[-limit:]
+        history = self.decision_history
+        start = max(len(history) - limit, 0) if limit else 0
+        return list(islice(history, start, None))
 
     def get_statistics(self) -> Dict:
         """Retorna estatísticas do Decision Engine"""
         if not self.decision_history:
             return {}
 
-        recent = self.decision_history[-100:]
+        recent = self.get_decision_history(100)
 
         action_counts = {}
         for d in recent:
@@ -14,11 +14,20 @@ Date: 2025-11-22
 """
 
 import numpy as np
-from typing import Dict, Tuple, Optional, List
+from typing import Deque, Dict, Tuple, Optional, List
 from dataclasses import dataclass
+from collections import deque
+from itertools import islice
 from enum import Enum
+from functools import lru_cache
 import time
 
+try:
+    from scipy.linalg import cho_factor, cho_solve
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
 
 class Action(Enum):
     """Ações autônomas disponíveis"""
@@ -64,6 +73,170 @@ class SystemState:
         )
 
 
+@lru_cache(maxsize=None)
+def _kf_step_kernel():
+    """
+    Ciclo predição/atualização Kalman compilado com numba (import e JIT sob demanda)
+
+    Em matrizes 5x5 o custo do filtro em NumPy é o despacho de cada
+    operação, não a aritmética; o kernel faz o ciclo inteiro em laços
+    compilados, escrevendo em buffers pré-alocados.
+
+    Returns:
+        Função kf_step(x, P, F, Q, R, z, x_pred, P_pred, FP, A, K, y) -> bool,
+        já compilada, ou None se numba não estiver instalado. Retorna False,
+        sem tocar x e P, se S não for positiva definida.
+    """
+    try:
+        from numba import njit
+    except ImportError:
+        return None
+
+    def kf_step(x, P, F, Q, R, z, x_pred, P_pred, FP, A, K, y):
+        # Atualiza x e P in-place; y recebe a inovação (H = I)
+        n = x.shape[0]
+
+        # Predição: x_pred = F x, P_pred = F P F^T + Q
+        for i in range(n):
+            acc = 0.0
+            for j in range(n):
+                acc += F[i, j] * x[j]
+            x_pred[i] = acc
+            for j in range(n):
+                acc = 0.0
+                for k in range(n):
+                    acc += F[i, k] * P[k, j]
+                FP[i, j] = acc
+        for i in range(n):
+            for j in range(n):
+                acc = Q[i, j]
+                for k in range(n):
+                    acc += FP[i, k] * F[j, k]
+                P_pred[i, j] = acc
+
+        # Inovação e sua covariância: y = z - x_pred, A = S = P_pred + R
+        for i in range(n):
+            y[i] = z[i] - x_pred[i]
+            for j in range(n):
+                A[i, j] = P_pred[i, j] + R[i, j]
+                K[i, j] = P_pred[j, i]
+
+        # Ganho: S = L L^T (Cholesky, S simétrica positiva definida) e
+        # resolve S K^T = P_pred^T por substituição direta e reversa
+        for j in range(n):
+            d = A[j, j]
+            for k in range(j):
+                d -= A[j, k] * A[j, k]
+            if not d > 0.0:
+                return False
+            d = np.sqrt(d)
+            A[j, j] = d
+            for i in range(j + 1, n):
+                acc = A[i, j]
+                for k in range(j):
+                    acc -= A[i, k] * A[j, k]
+                A[i, j] = acc / d
+        for c in range(n):
+            for j in range(n):
+                acc = K[c, j]
+                for k in range(c):
+                    acc -= A[c, k] * K[k, j]
+                K[c, j] = acc / A[c, c]
+        for c in range(n - 1, -1, -1):
+            for j in range(n):
+                acc = K[c, j]
+                for k in range(c + 1, n):
+                    acc -= A[k, c] * K[k, j]
+                K[c, j] = acc / A[c, c]
+        # K guarda K^T: K[j, i] é o ganho da componente i pela medição j
+
+        # Atualização: x = x_pred + K y, P = P_pred - K P_pred (forma curta)
+        for i in range(n):
+            acc = x_pred[i]
+            for j in range(n):
+                acc += K[j, i] * y[j]
+            x[i] = acc
+            for j in range(n):
+                acc = P_pred[i, j]
+                for k in range(n):
+                    acc -= K[k, i] * P_pred[k, j]
+                P[i, j] = acc
+        return True
+
+    return _jit_warm(njit, kf_step, lambda: (
+        np.zeros(2), np.eye(2), np.eye(2), np.eye(2), np.eye(2), np.zeros(2),
+        np.empty(2), np.empty((2, 2)), np.empty((2, 2)), np.empty((2, 2)),
+        np.empty((2, 2)), np.empty(2)
+    ))
+
+
+@lru_cache(maxsize=None)
+def _kf_run_kernel():
+    """
+    Recursão Kalman sobre uma sequência de medições em um único laço compilado
+
+    Cada passo equivale a predict(): kf_step, próximo estado previsto F x e
+    adaptação de Q como em _adapt_noise.
+
+    Returns:
+        Função kf_run(x, P, F, Q, R, Z, X_next, x_pred, P_pred, FP, A, K, y)
+        -> int com o número de passos concluídos (para antes de um S não
+        positivo definido), ou None se numba não estiver instalado
+    """
+    kf_step = _kf_step_kernel()
+    if kf_step is None:
+        return None
+    from numba import njit
+
+    def kf_run(x, P, F, Q, R, Z, X_next, x_pred, P_pred, FP, A, K, y):
+        n = x.shape[0]
+        for t in range(Z.shape[0]):
+            if not kf_step(x, P, F, Q, R, Z[t], x_pred, P_pred, FP, A, K, y):
+                return t
+
+            # Próximo estado previsto: F x
+            for i in range(n):
+                acc = 0.0
+                for j in range(n):
+                    acc += F[i, j] * x[j]
+                X_next[t, i] = acc
+
+            # Q = I * clip(||y||, 0.001, 0.1)
+            norm_sq = 0.0
+            for i in range(n):
+                norm_sq += y[i] * y[i]
+            scale = min(max(np.sqrt(norm_sq), 0.001), 0.1)
+            for i in range(n):
+                for j in range(n):
+                    Q[i, j] = 0.0
+                Q[i, i] = scale
+        return Z.shape[0]
+
+    return _jit_warm(njit, kf_run, lambda: (
+        np.zeros(2), np.eye(2), np.eye(2), np.eye(2), np.eye(2),
+        np.zeros((1, 2)), np.empty((1, 2)), np.empty(2), np.empty((2, 2)),
+        np.empty((2, 2)), np.empty((2, 2)), np.empty((2, 2)), np.empty(2)
+    ))
+
+
+def _jit_warm(njit, func, make_args):
+    """
+    Compila func com numba e aquece o JIT com make_args(), fora do caminho
+    de decisão
+
+    O cache em disco pode ter sido gerado com outro nome de módulo
+    (execução como script): nesse caso compila sem cache.
+    """
+    for cache in (True, False):
+        kernel = njit(cache=cache, fastmath=True)(func)
+        try:
+            kernel(*make_args())
+        except Exception:
+            continue
+        return kernel
+    return None
+
+
 @dataclass
 class PolicyPrediction:
     """Resultado da predição de policy"""
@@ -74,6 +247,24 @@ class PolicyPrediction:
     processing_time_ms: float
 
 
+# Pesos da regressão linear de _calculate_trend por tamanho de janela:
+# inclinação = janela @ pesos, com pesos = (x - x̄) / Σ(x - x̄)²
+_TREND_WEIGHTS = {
+    n: (np.arange(n) - (n - 1) / 2) / np.sum((np.arange(n) - (n - 1) / 2) ** 2)
+    for n in (3, 4, 5)
+}
+
+# Ação de cada regra de _select_action, na ordem de prioridade
+_RULE_ACTIONS = (
+    Action.SCALE_UP,    # 0: CPU alta (atual ou prevista)
+    Action.SCALE_UP,    # 1: latência alta (atual ou prevista)
+    Action.SCALE_DOWN,  # 2: subutilização
+    Action.ROLLBACK,    # 3: Ω-Score crítico
+    Action.RETUNE,      # 4: β decrescente
+    Action.NOOP,        # 5: sistema estável
+)
+
+
 class KalmanPolicyPredictor:
     """
     Policy Predictor baseado em Filtro Kalman Adaptativo
@@ -103,9 +294,20 @@ class KalmanPolicyPredictor:
         # Matriz de transição de estado (identidade inicialmente)
         self.F = np.eye(state_dim)
 
-        # Histórico para aprendizado
-        self.state_history: List[SystemState] = []
+        # Kernels compilados (opcionais) e seus buffers, reutilizados a cada
+        # passo; ambos compilam aqui, fora do caminho de decisão
+        self._kf_step = _kf_step_kernel()
+        self._kf_run = _kf_run_kernel() if self._kf_step is not None else None
+        self._x_pred = np.empty(state_dim)
+        self._P_pred = np.empty((state_dim, state_dim))
+        self._FP = np.empty((state_dim, state_dim))
+        self._S = np.empty((state_dim, state_dim))
+        self._K = np.empty((state_dim, state_dim))
+        self._y = np.empty(state_dim)
+
+        # Histórico para aprendizado (ring buffer: append O(1), memória fixa)
         self.max_history = 100
+        self.state_history: Deque[SystemState] = deque(maxlen=self.max_history)
 
     def predict(
         self,
@@ -126,23 +328,12 @@ class KalmanPolicyPredictor:
 
         # Atualiza histórico
         self.state_history.append(current_state)
-        if len(self.state_history) > self.max_history:
-            self.state_history.pop(0)
 
         # Converte estado atual para vetor
         z = current_state.to_vector()
 
-        # Passo 1: Predição Kalman
-        x_pred = self.F @ self.x
-        P_pred = self.F @ self.P @ self.F.T + self.Q
-
-        # Passo 2: Atualização com medição
-        y = z - x_pred  # Inovação
-        S = P_pred + self.R  # Covariância da inovação
-        K = P_pred @ np.linalg.inv(S)  # Ganho de Kalman
-
-        self.x = x_pred + K @ y
-        self.P = (np.eye(self.state_dim) - K) @ P_pred
+        # Passos 1-2: predição + atualização Kalman
+        y = self._filter_step(z)  # Inovação
 
         # Passo 3: Predição do próximo estado
         x_next = self.F @ self.x
@@ -173,6 +364,153 @@ class KalmanPolicyPredictor:
 
         return action, prediction
 
+    def predict_batch(
+        self,
+        states: List[SystemState],
+        target: str = 'max_availability'
+    ) -> Tuple[List[Action], List[PolicyPrediction]]:
+        """
+        Prediz ações para uma sequência de estados em uma única passada
+
+        Equivale a chamar predict() para cada estado, em ordem (mesmo filtro,
+        histórico e adaptação de ruído), mas a recursão Kalman roda em um
+        único laço compilado e as regras de decisão são avaliadas como
+        máscaras vetorizadas sobre o lote.
+
+        Args:
+            states: Estados do sistema, em ordem temporal
+            target: Objetivo ('max_availability', 'min_cost', 'balanced')
+
+        Returns:
+            (actions, predictions) na mesma ordem de states
+        """
+        start_time = time.time()
+        n_states = len(states)
+        if n_states == 0:
+            return [], []
+
+        # Medições (B, 5); latência bruta guardada para as regras
+        Z = np.array([
+            (s.omega_score, s.psi_index, s.beta_antifragile,
+             s.cpu_usage, s.latency_ms)
+            for s in states
+        ], dtype=np.float64)
+        latency_ms = Z[:, 4].copy()
+        Z[:, 4] /= 1000.0  # Normalizar para 0-1, como to_vector
+
+        # Histórico: janela de β anterior ao lote + atualização de uma vez
+        n_before = len(self.state_history)
+        prior_betas = [s.beta_antifragile for s in self._recent_states(4)]
+        self.state_history.extend(states)
+
+        # Passos 1-3 para todo o lote: filtro, próximo estado, ruído
+        X_next = np.empty_like(Z)
+        done = 0
+        if self._kf_run is not None:
+            done = self._kf_run(self.x, self.P, self.F, self.Q, self.R, Z, X_next,
+                                self._x_pred, self._P_pred, self._FP,
+                                self._S, self._K, self._y)
+        for t in range(done, n_states):
+            y = self._filter_step(Z[t])
+            X_next[t] = self.F @ self.x
+            self._adapt_noise(y)
+
+        # Tendência de β (regra 4) sobre a janela de até 5 estados de cada passo
+        betas = np.concatenate([prior_betas, Z[:, 2]])
+        window = np.minimum(n_before + np.arange(1, n_states + 1), 5)
+        beta_trend = np.full(n_states, np.nan)
+        for n, weights in _TREND_WEIGHTS.items():
+            idx = np.flatnonzero(window == n)
+            if idx.size:
+                ends = idx + len(prior_betas)
+                beta_trend[idx] = betas[ends[:, None] + np.arange(1 - n, 1)] @ weights
+
+        # Passo 4: regras de _select_action como máscaras, em ordem de prioridade
+        omega, cpu = Z[:, 0], Z[:, 3]
+        pred_cpu, pred_latency = X_next[:, 3], X_next[:, 4] * 1000.0
+        conditions = [
+            (cpu > 0.80) | (pred_cpu > 0.80),
+            (latency_ms > 200) | (pred_latency > 200),
+            (cpu < 0.30) & (latency_ms < 50),
+            omega < 0.70,
+            beta_trend < -0.1,  # NaN (histórico < 3) nunca dispara
+        ]
+        rules = np.select(conditions, np.arange(5), default=5)
+        confidences = np.select(conditions, [
+            np.minimum(1.0, cpu),
+            np.minimum(1.0, latency_ms / 200),
+            1.0 - cpu,
+            1.0 - omega,
+            np.abs(beta_trend),
+        ], default=omega)
+
+        # Tempo do lote rateado entre as predições
+        processing_time = (time.time() - start_time) * 1000 / n_states
+
+        actions = []
+        predictions = []
+        for state, rule, confidence, x_next, trend in zip(
+                states, rules.tolist(), confidences.tolist(), X_next, beta_trend.tolist()):
+            predicted_state = SystemState.from_vector(x_next, throughput=state.throughput)
+            action = _RULE_ACTIONS[rule]
+            actions.append(action)
+            predictions.append(PolicyPrediction(
+                action=action,
+                confidence=confidence,
+                predicted_state=predicted_state,
+                reasoning=self._reasoning(rule, state, predicted_state, trend),
+                processing_time_ms=processing_time
+            ))
+
+        return actions, predictions
+
+    def _filter_step(self, z: np.ndarray) -> np.ndarray:
+        """
+        Predição + atualização Kalman com a medição z (H = I)
+
+        Returns:
+            Inovação y = z - x_pred
+        """
+        if self._kf_step is not None and self._kf_step(
+                self.x, self.P, self.F, self.Q, self.R, z,
+                self._x_pred, self._P_pred, self._FP,
+                self._S, self._K, self._y):
+            # Caminho compilado: x e P atualizados in-place
+            return self._y
+
+        # Passo 1: Predição Kalman
+        x_pred = self.F @ self.x
+        P_pred = self.F @ self.P @ self.F.T + self.Q
+
+        # Passo 2: Atualização com medição
+        y = z - x_pred  # Inovação
+        S = P_pred + self.R  # Covariância da inovação
+        K = self._kalman_gain(P_pred, S)  # Ganho de Kalman
+
+        # P = (I - K) P_pred na forma curta P_pred - K P_pred (H = I):
+        # sem montar I - K nem alocar a identidade; x e P reescritos in-place
+        np.add(x_pred, K @ y, out=self.x)
+        np.subtract(P_pred, K @ P_pred, out=self.P)
+        return y
+
+    @staticmethod
+    def _kalman_gain(P_pred: np.ndarray, S: np.ndarray) -> np.ndarray:
+        """
+        Ganho K = P_pred S^-1 sem inverter S explicitamente
+
+        Com P_pred e S simétricas, K = (S^-1 P_pred)^T: uma solução por
+        Cholesky (SciPy) ou LU (NumPy). Se S for singular, usa a
+        pseudo-inversa.
+        """
+        try:
+            if SCIPY_AVAILABLE:
+                factor = cho_factor(S, lower=True, overwrite_a=True,
+                                    check_finite=False)
+                return cho_solve(factor, P_pred, check_finite=False).T
+            return np.linalg.solve(S, P_pred).T
+        except np.linalg.LinAlgError:
+            return P_pred @ np.linalg.pinv(S)
+
     def _select_action(
         self,
         current: SystemState,
@@ -189,51 +527,68 @@ class KalmanPolicyPredictor:
         4. β decrescente rápido → RETUNE
         5. Caso contrário → NOOP
         """
-        confidence = 0.0
-        reasoning = ""
-
         # Regra 1: Sobrecarga detectada ou prevista
         if current.cpu_usage > 0.80 or predicted.cpu_usage > 0.80:
             confidence = min(1.0, current.cpu_usage)
-            reasoning = f"CPU alta: {current.cpu_usage:.1%} (pred: {predicted.cpu_usage:.1%})"
-            return Action.SCALE_UP, confidence, reasoning
+            return Action.SCALE_UP, confidence, self._reasoning(0, current, predicted)
 
         if current.latency_ms > 200 or predicted.latency_ms > 200:
             confidence = min(1.0, current.latency_ms / 200)
-            reasoning = f"Latência alta: {current.latency_ms:.0f}ms (pred: {predicted.latency_ms:.0f}ms)"
-            return Action.SCALE_UP, confidence, reasoning
+            return Action.SCALE_UP, confidence, self._reasoning(1, current, predicted)
 
         # Regra 2: Subutilização (economizar recursos)
         if current.cpu_usage < 0.30 and current.latency_ms < 50:
             confidence = 1.0 - current.cpu_usage
-            reasoning = f"Subutilização: CPU {current.cpu_usage:.1%}, Lat {current.latency_ms:.0f}ms"
-            return Action.SCALE_DOWN, confidence, reasoning
+            return Action.SCALE_DOWN, confidence, self._reasoning(2, current, predicted)
 
         # Regra 3: Ω-Score crítico (qualidade baixa)
         if current.omega_score < 0.70:
             confidence = 1.0 - current.omega_score
-            reasoning = f"Ω-Score crítico: {current.omega_score:.3f} < 0.70"
-            return Action.ROLLBACK, confidence, reasoning
+            return Action.ROLLBACK, confidence, self._reasoning(3, current, predicted)
 
         # Regra 4: β decrescente rápido (perda de antifragilidade)
         if len(self.state_history) >= 3:
             beta_trend = self._calculate_trend('beta_antifragile')
             if beta_trend < -0.1:  # Queda de >10% recente
                 confidence = abs(beta_trend)
-                reasoning = f"β decrescente: tendência {beta_trend:.3f}"
-                return Action.RETUNE, confidence, reasoning
+                return Action.RETUNE, confidence, self._reasoning(
+                    4, current, predicted, beta_trend
+                )
 
         # Regra 5: Sistema estável
         confidence = current.omega_score
-        reasoning = f"Sistema estável: Ω={current.omega_score:.3f}, CPU={current.cpu_usage:.1%}"
-        return Action.NOOP, confidence, reasoning
+        return Action.NOOP, confidence, self._reasoning(5, current, predicted)
+
+    @staticmethod
+    def _reasoning(
+        rule: int,
+        current: SystemState,
+        predicted: SystemState,
+        beta_trend: float = 0.0
+    ) -> str:
+        """Explicação da regra de _select_action que decidiu (ver _RULE_ACTIONS)"""
+        if rule == 0:
+            return f"CPU alta: {current.cpu_usage:.1%} (pred: {predicted.cpu_usage:.1%})"
+        if rule == 1:
+            return f"Latência alta: {current.latency_ms:.0f}ms (pred: {predicted.latency_ms:.0f}ms)"
+        if rule == 2:
+            return f"Subutilização: CPU {current.cpu_usage:.1%}, Lat {current.latency_ms:.0f}ms"
+        if rule == 3:
+            return f"Ω-Score crítico: {current.omega_score:.3f} < 0.70"
+        if rule == 4:
+            return f"β decrescente: tendência {beta_trend:.3f}"
+        return f"Sistema estável: Ω={current.omega_score:.3f}, CPU={current.cpu_usage:.1%}"
+
+    def _recent_states(self, n: int) -> List[SystemState]:
+        """Últimos n estados do histórico (deque não aceita fatiamento)"""
+        return list(islice(self.state_history, max(len(self.state_history) - n, 0), None))
 
     def _calculate_trend(self, metric: str) -> float:
         """Calcula tendência de uma métrica no histórico recente"""
         if len(self.state_history) < 3:
             return 0.0
 
-        recent = self.state_history[-5:]
+        recent = self._recent_states(5)
         values = [getattr(s, metric) for s in recent]
 
         # Regressão linear simples
@@ -257,12 +612,14 @@ class KalmanPolicyPredictor:
 
         # Escala adaptativa: [0.001, 0.1]
         scale = np.clip(innovation_norm, 0.001, 0.1)
-        self.Q = np.eye(self.state_dim) * scale
+        self.Q.fill(0.0)
+        np.fill_diagonal(self.Q, scale)
 
     def reset(self):
         """Reseta estado do filtro"""
-        self.x = np.zeros(self.state_dim)
-        self.P = np.eye(self.state_dim) * 1.0
+        self.x.fill(0.0)
+        self.P.fill(0.0)
+        np.fill_diagonal(self.P, 1.0)
         self.state_history.clear()
 
 
@@ -20,12 +20,16 @@ Date: 2025-11-22
 
 import time
 import psutil
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass, field
 from collections import defaultdict, deque
 import threading
 
 
+# Chave plana de métrica: (nome, pares (label, valor) ordenados)
+MetricKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
 @dataclass
 class MetricPoint:
     """Ponto único de métrica com timestamp"""
@@ -54,12 +58,15 @@ class MetricsCollector:
 
         # Armazenamento de métricas (thread-safe)
         self._lock = threading.RLock()
-        self._metrics: Dict[str, deque] = defaultdict(
+        self._metrics: Dict[MetricKey, deque] = defaultdict(
             lambda: deque(maxlen=retention_points)
         )
 
         # Cache de última leitura
-        self._last_values: Dict[str, float] = {}
+        self._last_values: Dict[MetricKey, float] = {}
+
+        # Último export Prometheus; None quando alguma métrica mudou desde então
+        self._prometheus_cache: Optional[str] = None
 
         # Thread de coleta automática
         self._collection_thread: Optional[threading.Thread] = None
@@ -84,10 +91,19 @@ class MetricsCollector:
             self._collection_thread.join(timeout=2.0)
 
     def _auto_collect_loop(self):
-        """Loop de coleta automática"""
+        """
+        Loop de coleta automática
+
+        Agenda por prazo fixo (sem acumular o tempo da coleta; se atrasar,
+        segue do instante atual em vez de disparar em rajada) e espera no
+        próprio evento de parada, então stop_auto_collection acorda o loop
+        na hora em vez de aguardar o fim do intervalo.
+        """
+        next_tick = time.monotonic()
         while not self._stop_collection.is_set():
             self.collect_system_metrics()
-            time.sleep(self.collection_interval)
+            next_tick = max(next_tick + self.collection_interval, time.monotonic())
+            self._stop_collection.wait(max(next_tick - time.monotonic(), 0.0))
 
     def record_metric(
         self,
@@ -118,6 +134,7 @@ class MetricsCollector:
         with self._lock:
             self._metrics[metric_key].append(point)
             self._last_values[metric_key] = value
+            self._prometheus_cache = None
 
     def get_current_value(
         self,
@@ -178,11 +195,16 @@ class MetricsCollector:
         # HELP metric_name Descrição
         # TYPE metric_name gauge
         metric_name{label="value"} 0.95 1234567890
+
+        O texto é reaproveitado entre scrapes até o próximo record_metric.
         """
         lines = []
         seen_names = set()
 
         with self._lock:
+            if self._prometheus_cache is not None:
+                return self._prometheus_cache
+
             for metric_key, history in self._metrics.items():
                 if not history:
                     continue
@@ -205,20 +227,30 @@ class MetricsCollector:
                 timestamp_ms = int(latest.timestamp * 1000)
                 lines.append(f"{latest.name}{labels_str} {latest.value} {timestamp_ms}")
 
-        return "\n".join(lines) + "\n"
+            self._prometheus_cache = "\n".join(lines) + "\n"
+            return self._prometheus_cache
 
     def get_snapshot(self) -> Dict[str, float]:
-        """Obtém snapshot de todas as métricas atuais"""
+        """Obtém snapshot de todas as métricas atuais (chaves 'nome{k=v,...}')"""
         with self._lock:
-            return self._last_values.copy()
+            items = list(self._last_values.items())
+        return {self._format_key(key): value for key, value in items}
+
+    @staticmethod
+    def _make_key(name: str, labels: Dict[str, str]) -> MetricKey:
+        """Cria chave única (hashable, sem formatar string) para métrica + labels"""
+        if not labels:
+            return (name, ())
+        return (name, tuple(sorted(labels.items())))
 
-    def _make_key(self, name: str, labels: Dict[str, str]) -> str:
-        """Cria chave única para métrica + labels"""
+    @staticmethod
+    def _format_key(key: MetricKey) -> str:
+        """Representação textual da chave, usada só no snapshot"""
+        name, labels = key
         if not labels:
             return name
 
-        labels_sorted = sorted(labels.items())
-        labels_str = ",".join(f"{k}={v}" for k, v in labels_sorted)
+        labels_str = ",".join(f"{k}={v}" for k, v in labels)
         return f"{name}{{{labels_str}}}"
 
     def clear(self):
@@ -226,6 +258,7 @@ class MetricsCollector:
         with self._lock:
             self._metrics.clear()
             self._last_values.clear()
+            self._prometheus_cache = None
 
 
 # === CLASSE DE INTEGRAÇÃO COM MATVERSE ===
@@ -244,8 +277,16 @@ class MatVerseMetricsCollector(MetricsCollector):
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
+        self._init_matverse_metrics()
+
+    def reset(self):
+        """Volta ao estado recém-construído (limpa e re-inicializa as métricas)"""
+        with self._lock:
+            self.clear()
+            self._init_matverse_metrics()
 
-        # Inicializa métricas específicas do MatVerse
+    def _init_matverse_metrics(self):
+        """Inicializa métricas específicas do MatVerse"""
         self.record_metric("omega_score_current", 0.0)
         self.record_metric("psi_index_current", 0.0)
         self.record_metric("beta_antifragile_current", 0.0)
@@ -269,6 +269,10 @@ class PoSEClient:
 
     def _mock_vote(self, proposal_id: int, support: bool) -> VoteResult:
         """Mock: Vota em proposta"""
+        return self._mock_vote_batch(proposal_id, support, 1)
+
+    def _mock_vote_batch(self, proposal_id: int, support: bool, count: int) -> VoteResult:
+        """Mock: Registra `count` votos de mesmo sentido em uma única atualização"""
         if proposal_id not in self.mock_proposals:
             return VoteResult(
                 proposal_id=proposal_id,
@@ -279,8 +283,8 @@ class PoSEClient:
 
         proposal = self.mock_proposals[proposal_id]
 
-        # Simula voto com peso 100
-        vote_weight = 100
+        # Simula votos com peso 100 cada
+        vote_weight = 100 * count
 
         if support:
             proposal.votes_for += vote_weight
@@ -447,8 +451,7 @@ def demo_pose_client():
     print(f"   ✅ Voto registrado: success={vote_result.success}")
 
     # Simula mais votos
-    for i in range(5):
-        client._mock_vote(proposal_id, support=True)
+    client._mock_vote_batch(proposal_id, support=True, count=5)
 
     print(f"\n⏰ Finalizando proposta {proposal_id}...")
     finalized = client.finalize(proposal_id)
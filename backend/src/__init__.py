@@ -0,0 +1,3 @@
+"""
+MatVerse Unified Ecosystem - Backend Python (Kalman + PQC + Ω-GATE)
+"""
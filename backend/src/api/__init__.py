@@ -0,0 +1 @@
+"""API HTTP do ecossistema unificado"""
@@ -19,11 +19,12 @@ from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
 import uvicorn
 
-# Adiciona diretório src ao path
-src_path = Path(__file__).parent.parent
-sys.path.insert(0, str(src_path))
-
-from integration.omega_gate_integration import OmegaGateProcessor
+# Execução direta (python main.py): expõe o pacote src via diretório backend
+if __package__ in (None, ''):
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+    from src.integration.omega_gate_integration import OmegaGateProcessor
+else:
+    from ..integration.omega_gate_integration import OmegaGateProcessor
 
 
 # ========== MODELS ==========
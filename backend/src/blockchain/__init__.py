@@ -0,0 +1 @@
+"""Assinatura pós-quântica e notas de evidência"""
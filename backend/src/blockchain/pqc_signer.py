@@ -12,12 +12,127 @@ Date: 2025-11-22
 """
 
 import hashlib
+import math
 import time
 import secrets
-from typing import Dict, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
 import json
 
+# Construtores de hash ligados uma vez (evita lookup de atributo por chamada)
+_SHA256 = hashlib.sha256
+_SHA512 = hashlib.sha512
+
+# Schema fixo do Evidence Note (campos assinados)
+_EVIDENCE_KEYS = frozenset(
+    ('content', 'id', 'issuer', 'timestamp', 'type', 'version')
+)
+
+# Encoders pré-construídos (json.dumps(sort_keys=True) cria um por chamada)
+_encode_sorted = json.JSONEncoder(sort_keys=True).encode
+_encode_str = json.encoder.encode_basestring_ascii
+
+
+def _serialize_content(content: Dict) -> bytes:
+    """Serialização canônica do 'content' (json com chaves ordenadas)"""
+    return _encode_sorted(content).encode()
+
+
+def _serialize_evidence_note(note: Dict,
+                             content_bytes: Optional[bytes] = None) -> bytes:
+    """
+    Serialização canônica do Evidence Note para assinatura
+
+    Formatador especializado para o schema fixo: produz exatamente os
+    mesmos bytes que json.dumps(note, sort_keys=True), mas só passa pelo
+    encoder genérico para o 'content' (schema livre). Qualquer desvio do
+    schema cai no caminho genérico.
+
+    Args:
+        note: Campos assinados do Evidence Note
+        content_bytes: _serialize_content(note['content']) já calculado
+    """
+    timestamp = note.get('timestamp')
+    if (note.keys() != _EVIDENCE_KEYS
+            or type(timestamp) is not float
+            or not math.isfinite(timestamp)
+            or not all(type(note[key]) is str
+                       for key in ('id', 'issuer', 'type', 'version'))):
+        return _encode_sorted(note).encode()
+
+    if content_bytes is None:
+        content_bytes = _serialize_content(note['content'])
+
+    return b'{"content": ' + content_bytes + (
+        ', "id": ' + _encode_str(note['id']) +
+        ', "issuer": ' + _encode_str(note['issuer']) +
+        ', "timestamp": ' + repr(timestamp) +
+        ', "type": ' + _encode_str(note['type']) +
+        ', "version": ' + _encode_str(note['version']) +
+        '}'
+    ).encode()
+
+
+def _derive_public_key(private_key_bytes: bytes) -> bytes:
+    """
+    Deriva chave pública (função pura da chave privada)
+
+    Sem cache global: chaves privadas não ficam retidas no processo
+    depois de rotacionadas.
+    """
+    return _SHA256(
+        private_key_bytes + b"_public_key_derivation"
+    ).digest()
+
+
+def _merkle_leaf(data: bytes) -> bytes:
+    """Hash de folha Merkle (prefixo 0x00 separa folhas de nós internos)"""
+    return _SHA256(b"\x00" + data).digest()
+
+
+def _merkle_node(left: bytes, right: bytes) -> bytes:
+    """Hash de nó interno Merkle (prefixo 0x01)"""
+    return _SHA256(b"\x01" + left + right).digest()
+
+
+def _merkle_tree(leaves: List[bytes]) -> Tuple[bytes, List[List[List[str]]]]:
+    """
+    Constrói árvore Merkle sobre as folhas
+
+    Níveis com número ímpar de nós duplicam o último.
+
+    Returns:
+        Tupla (raiz, caminhos); caminho[i] é a lista de [irmão_hex, lado]
+        da folha i até a raiz, com lado 'L' se o irmão fica à esquerda
+    """
+    paths: List[List[List[str]]] = [[] for _ in leaves]
+    positions = list(range(len(leaves)))
+    level = list(leaves)
+
+    while len(level) > 1:
+        if len(level) % 2:
+            level.append(level[-1])
+        for i, pos in enumerate(positions):
+            sibling = pos ^ 1
+            paths[i].append([level[sibling].hex(), 'L' if sibling < pos else 'R'])
+            positions[i] = pos // 2
+        level = [_merkle_node(level[j], level[j + 1])
+                 for j in range(0, len(level), 2)]
+
+    return level[0], paths
+
+
+def _merkle_fold(leaf: bytes, path: List[List[str]]) -> bytes:
+    """Recalcula a raiz Merkle a partir da folha e do caminho de inclusão"""
+    node = leaf
+    for sibling_hex, side in path:
+        sibling = bytes.fromhex(sibling_hex)
+        if side == 'L':
+            node = _merkle_node(sibling, node)
+        else:
+            node = _merkle_node(node, sibling)
+    return node
+
 
 @dataclass
 class PQCKeyPair:
@@ -70,9 +185,7 @@ class SPHINCSPlusSigner:
         private_seed = secrets.token_bytes(32)
 
         # Deriva chave pública usando hash
-        public_key_bytes = hashlib.sha256(
-            private_seed + b"_public_key_derivation"
-        ).digest()
+        public_key_bytes = _derive_public_key(private_seed)
 
         # Converte para hex
         private_key = private_seed.hex()
@@ -102,33 +215,61 @@ class SPHINCSPlusSigner:
         Returns:
             PQCSignature contendo a assinatura
         """
+        # Deriva chave pública da privada (sign_with_keypair evita o custo)
+        public_key = _derive_public_key(bytes.fromhex(private_key)).hex()
+
+        return self._sign(message, self._prefix_state(private_key),
+                          public_key, metadata)
+
+    def sign_with_keypair(self,
+                          message: bytes,
+                          keypair: PQCKeyPair,
+                          metadata: Optional[Dict] = None) -> PQCSignature:
+        """
+        Assina uma mensagem com um keypair já conhecido
+
+        Evita re-derivar a chave pública, que já está no keypair.
+
+        Args:
+            message: Mensagem em bytes a ser assinada
+            keypair: PQCKeyPair gerado por generate_keypair
+            metadata: Metadados opcionais
+
+        Returns:
+            PQCSignature contendo a assinatura
+        """
+        return self._sign(
+            message,
+            self._prefix_state(keypair.private_key),
+            keypair.public_key,
+            metadata
+        )
+
+    def _sign(self,
+              message: bytes,
+              prefix: "hashlib._Hash",
+              public_key: str,
+              metadata: Optional[Dict]) -> PQCSignature:
+        """Núcleo da assinatura (chave pública e prefixo da chave privada já resolvidos)"""
         # Hash da mensagem
-        message_hash = hashlib.sha256(message).digest()
+        message_hash = _SHA256(message).digest()
 
         # Timestamp
         timestamp = time.time()
 
         # Cria assinatura: Hash(private_key || message_hash || timestamp)
         # Nota: Simplificado. SPHINCS+ real usa árvores de Merkle e One-Time Signatures
-        private_key_bytes = bytes.fromhex(private_key)
-
-        signature_data = (
-            private_key_bytes +
-            message_hash +
-            str(timestamp).encode() +
-            (json.dumps(metadata).encode() if metadata else b"")
-        )
-
-        signature_bytes = hashlib.sha512(signature_data).digest()
+        signature_hash = prefix.copy()
+        signature_hash.update(message_hash)
+        signature_hash.update(str(timestamp).encode())
+        if metadata:
+            signature_hash.update(json.dumps(metadata).encode())
 
-        # Deriva chave pública da privada
-        public_key_bytes = hashlib.sha256(
-            private_key_bytes + b"_public_key_derivation"
-        ).digest()
+        signature_bytes = signature_hash.digest()
 
         signature = PQCSignature(
             signature=signature_bytes.hex(),
-            public_key=public_key_bytes.hex(),
+            public_key=public_key,
             algorithm=self.algorithm,
             timestamp=timestamp,
             message_hash=message_hash.hex()
@@ -136,6 +277,17 @@ class SPHINCSPlusSigner:
 
         return signature
 
+    @staticmethod
+    def _prefix_state(private_key: str) -> "hashlib._Hash":
+        """
+        Estado SHA-512 já alimentado com a chave privada
+
+        O assinador não guarda estado por chave: quem assina muitas vezes com
+        a mesma chave (PQCEvidenceNote) guarda o prefixo junto do keypair e o
+        repassa a _sign, e ele some quando o keypair é substituído.
+        """
+        return _SHA512(bytes.fromhex(private_key))
+
     def verify(self,
                message: bytes,
                signature: PQCSignature) -> bool:
@@ -150,9 +302,7 @@ class SPHINCSPlusSigner:
             True se assinatura válida, False caso contrário
         """
         # Verifica hash da mensagem
-        message_hash = hashlib.sha256(message).digest()
-
-        if message_hash.hex() != signature.message_hash:
+        if _SHA256(message).hexdigest() != signature.message_hash:
             return False
 
         # Verificação adicional: timestamp não pode ser futuro
@@ -177,61 +327,165 @@ class PQCEvidenceNote:
 
     def __init__(self, signer: SPHINCSPlusSigner):
         self.signer = signer
+
+        # Par de chaves gerado uma vez por sistema de evidências; a chave
+        # pública já sai codificada (hex) e é injetada por referência em
+        # cada assinatura.
         self.keypair = signer.generate_keypair()
 
+        # (keypair, estado-prefixo SHA-512 da sua chave privada), calculado
+        # aqui para que a primeira nota não pague a derivação; recalculado
+        # se self.keypair for substituído
+        self._sign_prefix = (self.keypair,
+                             signer._prefix_state(self.keypair.private_key))
+
+    @staticmethod
+    def serialize_content(content: Dict) -> bytes:
+        """
+        Serialização canônica de um conteúdo de evidência
+
+        Pode ser calculada uma vez pelo chamador e repassada a
+        create_evidence via content_bytes, evitando re-serializar o mesmo
+        conteúdo. A verificação sempre re-serializa o conteúdo da nota.
+
+        Args:
+            content: Conteúdo da evidência
+
+        Returns:
+            JSON canônico (chaves ordenadas) em bytes
+        """
+        return _serialize_content(content)
+
     def create_evidence(self,
                        content: Dict,
-                       evidence_type: str = "IP_PROTECTION") -> Dict:
+                       evidence_type: str = "IP_PROTECTION",
+                       content_bytes: Optional[bytes] = None) -> Dict:
         """
         Cria Evidence Note com assinatura PQC
 
         Args:
             content: Conteúdo da evidência
             evidence_type: Tipo de evidência (IP_PROTECTION, EXPERIMENT, etc)
+            content_bytes: serialize_content(content), se já calculado
 
         Returns:
             Evidence Note completo com assinatura PQC
         """
-        # ID único
-        evidence_id = hashlib.sha256(
-            (str(time.time()) + json.dumps(content)).encode()
-        ).hexdigest()[:16].upper()
+        if content_bytes is None:
+            content_bytes = _serialize_content(content)
 
-        # Conteúdo estruturado
-        evidence_note = {
-            'id': f"MATVERSE_EVIDENCE_{evidence_id}",
-            'type': evidence_type,
-            'timestamp': time.time(),
-            'content': content,
-            'version': '1.0.0',
-            'issuer': 'MatVerse Unified Ecosystem'
-        }
+        evidence_note = self._build_note(content, evidence_type, content_bytes)
 
         # Serializa para assinatura
-        evidence_bytes = json.dumps(evidence_note, sort_keys=True).encode()
+        evidence_bytes = _serialize_evidence_note(evidence_note, content_bytes)
 
         # Assina com PQC
-        signature = self.signer.sign(
+        signature = self._sign(
             evidence_bytes,
-            self.keypair.private_key,
             metadata={'evidence_id': evidence_note['id']}
         )
 
         # Evidence Note completo
         signed_evidence = {
             **evidence_note,
-            'pqc_signature': {
-                'signature': signature.signature,
-                'public_key': signature.public_key,
-                'algorithm': signature.algorithm,
-                'timestamp': signature.timestamp,
-                'message_hash': signature.message_hash
-            },
+            'pqc_signature': self._signature_dict(signature),
             'verification_url': f"https://matverse.io/verify/{evidence_note['id']}"
         }
 
         return signed_evidence
 
+    def create_evidence_batch(self,
+                              contents: List[Dict],
+                              evidence_type: str = "IP_PROTECTION") -> List[Dict]:
+        """
+        Cria vários Evidence Notes com uma única assinatura PQC agregada
+
+        Cada nota vira uma folha de uma árvore Merkle; só a raiz é assinada.
+        Cada nota leva a assinatura da raiz em 'pqc_signature' e seu caminho
+        de inclusão O(log N) em 'merkle_proof'.
+
+        Args:
+            contents: Conteúdos das evidências
+            evidence_type: Tipo de evidência (IP_PROTECTION, EXPERIMENT, etc)
+
+        Returns:
+            Lista de Evidence Notes na mesma ordem de contents
+        """
+        if not contents:
+            return []
+
+        contents_bytes = [_serialize_content(content) for content in contents]
+        notes = [self._build_note(content, evidence_type, content_bytes)
+                 for content, content_bytes in zip(contents, contents_bytes)]
+        leaves = [_merkle_leaf(_serialize_evidence_note(note, content_bytes))
+                  for note, content_bytes in zip(notes, contents_bytes)]
+        root, paths = _merkle_tree(leaves)
+
+        # Uma assinatura para o lote inteiro
+        signature = self._sign(
+            root,
+            metadata={'merkle_leaves': len(notes)}
+        )
+        signature_data = self._signature_dict(signature)
+        root_hex = root.hex()
+
+        return [
+            {
+                **note,
+                'pqc_signature': dict(signature_data),
+                'merkle_proof': {
+                    'root': root_hex,
+                    'leaf_index': i,
+                    'path': paths[i]
+                },
+                'verification_url': f"https://matverse.io/verify/{note['id']}"
+            }
+            for i, note in enumerate(notes)
+        ]
+
+    def _sign(self, message: bytes, metadata: Dict) -> PQCSignature:
+        """Assina com self.keypair, reaproveitando o prefixo da sua chave"""
+        keypair, prefix = self._sign_prefix
+        if keypair is not self.keypair:
+            keypair = self.keypair
+            prefix = self.signer._prefix_state(keypair.private_key)
+            self._sign_prefix = (keypair, prefix)
+        return self.signer._sign(message, prefix, keypair.public_key, metadata)
+
+    def _build_note(self,
+                    content: Dict,
+                    evidence_type: str,
+                    content_bytes: bytes) -> Dict:
+        """Monta os campos assinados de um Evidence Note"""
+        timestamp = time.time()
+
+        # ID único: SHA-256(timestamp || content), 8 bytes = 16 hex chars
+        id_hash = _SHA256()
+        id_hash.update(str(timestamp).encode())
+        id_hash.update(content_bytes)
+        evidence_id = id_hash.digest()[:8].hex().upper()
+
+        # Conteúdo estruturado
+        return {
+            'id': f"MATVERSE_EVIDENCE_{evidence_id}",
+            'type': evidence_type,
+            'timestamp': timestamp,
+            'content': content,
+            'version': '1.0.0',
+            'issuer': 'MatVerse Unified Ecosystem'
+        }
+
+    @staticmethod
+    def _signature_dict(signature: PQCSignature) -> Dict:
+        """Formato serializado de PQCSignature dentro do Evidence Note"""
+        return {
+            'signature': signature.signature,
+            'public_key': signature.public_key,
+            'algorithm': signature.algorithm,
+            'timestamp': signature.timestamp,
+            'message_hash': signature.message_hash
+        }
+
     def verify_evidence(self, evidence_note: Dict) -> Tuple[bool, str]:
         """
         Verifica Evidence Note
@@ -243,36 +497,100 @@ class PQCEvidenceNote:
             Tupla (válido, mensagem)
         """
         try:
-            # Extrai assinatura
-            pqc_sig_data = evidence_note['pqc_signature']
-
-            signature = PQCSignature(
-                signature=pqc_sig_data['signature'],
-                public_key=pqc_sig_data['public_key'],
-                algorithm=pqc_sig_data['algorithm'],
-                timestamp=pqc_sig_data['timestamp'],
-                message_hash=pqc_sig_data['message_hash']
+            signature, message = self._signed_message(evidence_note)
+            return self._verification_result(
+                message is not None and self.signer.verify(message, signature)
             )
 
-            # Remove assinatura temporariamente
-            evidence_copy = evidence_note.copy()
-            del evidence_copy['pqc_signature']
-            if 'verification_url' in evidence_copy:
-                del evidence_copy['verification_url']
+        except Exception as e:
+            return False, f"❌ Erro na verificação: {str(e)}"
 
-            # Serializa conteúdo
-            evidence_bytes = json.dumps(evidence_copy, sort_keys=True).encode()
+    def verify_evidence_batch(self,
+                              evidence_notes: List[Dict]) -> List[Tuple[bool, str]]:
+        """
+        Verifica vários Evidence Notes, checando cada assinatura distinta uma vez
 
-            # Verifica assinatura
-            is_valid = self.signer.verify(evidence_bytes, signature)
+        Notas de um mesmo lote (create_evidence_batch) compartilham chave
+        pública e assinatura da raiz Merkle: a assinatura é verificada uma
+        única vez por (raiz, assinatura) e cada nota só refaz seu caminho
+        de inclusão.
 
-            if is_valid:
-                return True, "✅ Evidence Note válido - Assinatura PQC verificada"
-            else:
-                return False, "❌ Assinatura PQC inválida"
+        Args:
+            evidence_notes: Evidence Notes a serem verificados
 
-        except Exception as e:
-            return False, f"❌ Erro na verificação: {str(e)}"
+        Returns:
+            Tuplas (válido, mensagem) na mesma ordem de evidence_notes
+        """
+        verified: Dict[Tuple, bool] = {}
+        results = []
+
+        for evidence_note in evidence_notes:
+            try:
+                signature, message = self._signed_message(evidence_note)
+                if message is None:
+                    results.append(self._verification_result(False))
+                    continue
+
+                key = (message, signature.signature, signature.public_key,
+                       signature.algorithm, signature.timestamp,
+                       signature.message_hash)
+                is_valid = verified.get(key)
+                if is_valid is None:
+                    is_valid = verified[key] = self.signer.verify(message, signature)
+                results.append(self._verification_result(is_valid))
+
+            except Exception as e:
+                results.append((False, f"❌ Erro na verificação: {str(e)}"))
+
+        return results
+
+    @staticmethod
+    def _signed_message(evidence_note: Dict) -> Tuple[PQCSignature, Optional[bytes]]:
+        """
+        Assinatura de um Evidence Note e a mensagem que ela cobre
+
+        Returns:
+            Tupla (assinatura, mensagem); a mensagem é a nota serializada ou,
+            para notas de lote, a raiz Merkle (None se o caminho de inclusão
+            não reconstrói a raiz declarada)
+        """
+        # Extrai assinatura
+        pqc_sig_data = evidence_note['pqc_signature']
+
+        signature = PQCSignature(
+            signature=pqc_sig_data['signature'],
+            public_key=pqc_sig_data['public_key'],
+            algorithm=pqc_sig_data['algorithm'],
+            timestamp=pqc_sig_data['timestamp'],
+            message_hash=pqc_sig_data['message_hash']
+        )
+
+        # Remove assinatura temporariamente
+        evidence_copy = evidence_note.copy()
+        del evidence_copy['pqc_signature']
+        if 'verification_url' in evidence_copy:
+            del evidence_copy['verification_url']
+        merkle_proof = evidence_copy.pop('merkle_proof', None)
+
+        # Serializa conteúdo
+        evidence_bytes = _serialize_evidence_note(evidence_copy)
+
+        # Assinatura direta ou sobre a raiz Merkle do lote
+        if merkle_proof is None:
+            return signature, evidence_bytes
+
+        root = _merkle_fold(_merkle_leaf(evidence_bytes), merkle_proof['path'])
+        if root.hex() != merkle_proof['root']:
+            return signature, None
+        return signature, root
+
+    @staticmethod
+    def _verification_result(is_valid: bool) -> Tuple[bool, str]:
+        """Tupla (válido, mensagem) de verify_evidence"""
+        if is_valid:
+            return True, "✅ Evidence Note válido - Assinatura PQC verificada"
+        else:
+            return False, "❌ Assinatura PQC inválida"
 
 
 def test_pqc_system():
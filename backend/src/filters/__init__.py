@@ -0,0 +1 @@
+"""Filtros adaptativos (Kalman CFC)"""
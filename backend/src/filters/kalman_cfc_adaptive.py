@@ -11,10 +11,15 @@ Version: 1.0.0
 Date: 2025-11-22
 """
 
+import math
 import numpy as np
-from typing import Tuple, Dict, List, Optional
+from concurrent.futures import ProcessPoolExecutor
+from typing import Tuple, Dict, List, Optional, TYPE_CHECKING
 from dataclasses import dataclass
-import time
+from time import perf_counter_ns as _perf_counter_ns
+
+if TYPE_CHECKING:
+    from numpy.typing import ArrayLike
 
 
 @dataclass
@@ -28,6 +33,10 @@ class KalmanState:
     iteration: int = 0
 
 
+# Capacidade inicial do histórico colunar (dobra quando enche)
+_HISTORY_INITIAL_CAPACITY = 64
+
+
 class AdaptiveKalmanCFC:
     """
     Filtro Kalman Adaptativo para otimização CFC
@@ -68,14 +77,156 @@ class AdaptiveKalmanCFC:
         # Matriz de observação (medimos diretamente Ψ e Γ)
         self.H = np.eye(2)
 
-        # Histórico
-        self.history: List[KalmanState] = []
+        # Último ganho de Kalman (atualizado in-place por step)
+        self.K_last = np.zeros((2, 2))
+
+        # Histórico em layout colunar (SoA): uma matriz por campo,
+        # permitindo reduções NumPy diretas sobre a trajetória
+        self._hist = self._alloc_history(_HISTORY_INITIAL_CAPACITY)
+        self._hist_len = 0
         self.iteration = 0
 
+    @staticmethod
+    def _alloc_history(capacity: int) -> Dict[str, np.ndarray]:
+        """Aloca colunas do histórico com a capacidade dada"""
+        return {
+            'x': np.empty((capacity, 2)),
+            'P': np.empty((capacity, 2, 2)),
+            'Q': np.empty((capacity, 2, 2)),
+            'R': np.empty((capacity, 2, 2)),
+            'K': np.empty((capacity, 2, 2)),
+            'iteration': np.empty(capacity, dtype=np.int64)
+        }
+
+    def _record_history(self):
+        """Grava o estado atual na próxima linha do histórico colunar"""
+        i = self._hist_len
+        if i == len(self._hist['iteration']):
+            grown = self._alloc_history(2 * i)
+            for key, column in self._hist.items():
+                grown[key][:i] = column
+            self._hist = grown
+
+        h = self._hist
+        h['x'][i] = self.x
+        h['P'][i] = self.P
+        h['Q'][i] = self.Q
+        h['R'][i] = self.R
+        h['K'][i] = self.K_last
+        h['iteration'][i] = self.iteration
+        self._hist_len = i + 1
+
+    @property
+    def hist(self) -> Dict[str, np.ndarray]:
+        """
+        Histórico colunar (views sem cópia, uma linha por iteração)
+
+        Returns:
+            Dict com 'x' (N,2), 'P'/'Q'/'R'/'K' (N,2,2) e 'iteration' (N,)
+        """
+        n = self._hist_len
+        return {key: column[:n] for key, column in self._hist.items()}
+
+    def get_state(self, i: int) -> KalmanState:
+        """
+        Reconstrói o KalmanState da i-ésima linha do histórico
+
+        Args:
+            i: Índice da iteração no histórico (aceita negativos)
+
+        Returns:
+            KalmanState com cópias das matrizes
+        """
+        if i < 0:
+            i += self._hist_len
+        if not 0 <= i < self._hist_len:
+            raise IndexError("índice fora do histórico")
+
+        h = self._hist
+        return KalmanState(
+            x=h['x'][i].copy(),
+            P=h['P'][i].copy(),
+            Q=h['Q'][i].copy(),
+            R=h['R'][i].copy(),
+            K=h['K'][i].copy(),
+            iteration=int(h['iteration'][i])
+        )
+
+    @property
+    def history(self) -> List[KalmanState]:
+        """Histórico como lista de KalmanState (compatibilidade)"""
+        return [self.get_state(i) for i in range(self._hist_len)]
+
+    def step(self, psi_measured: float, gamma_measured: float) -> Tuple[float, float]:
+        """
+        Predição + atualização fundidas em um único passo escalar
+
+        Como F = H = I, as equações se reduzem a aritmética sobre os
+        elementos das matrizes 2x2, sem matrizes intermediárias. x, P e
+        K_last são atualizados in-place; o resultado é idêntico a
+        predict() seguido de update().
+
+        Args:
+            psi_measured: Valor medido de Ψ
+            gamma_measured: Valor medido de Γ
+
+        Returns:
+            Inovação (y_Ψ, y_Γ) = z - x̂⁻
+        """
+        x0, x1 = self.x.tolist()
+        (p00, p01), (p10, p11) = self.P.tolist()
+        (q00, q01), (q10, q11) = self.Q.tolist()
+        (r00, r01), (r10, r11) = self.R.tolist()
+
+        # Predição: x̂⁻ = x̂, P⁻ = P + Q
+        p00 += q00
+        p01 += q01
+        p10 += q10
+        p11 += q11
+
+        # Inovação: y = z - x̂⁻
+        y0 = psi_measured - x0
+        y1 = gamma_measured - x1
+
+        # S = P⁻ + R e ganho K = P⁻·S⁻¹ (inversa 2x2 fechada)
+        s00 = p00 + r00
+        s01 = p01 + r01
+        s10 = p10 + r10
+        s11 = p11 + r11
+        inv_det = 1.0 / (s00 * s11 - s01 * s10)
+
+        k00 = (p00 * s11 - p01 * s10) * inv_det
+        k01 = (p01 * s00 - p00 * s01) * inv_det
+        k10 = (p10 * s11 - p11 * s10) * inv_det
+        k11 = (p11 * s00 - p10 * s01) * inv_det
+
+        # x̂ = x̂⁻ + K·y
+        x = self.x
+        x[0] = x0 + k00 * y0 + k01 * y1
+        x[1] = x1 + k10 * y0 + k11 * y1
+
+        # P = (I - K)·P⁻
+        P = self.P
+        P[0, 0] = p00 - (k00 * p00 + k01 * p10)
+        P[0, 1] = p01 - (k00 * p01 + k01 * p11)
+        P[1, 0] = p10 - (k10 * p00 + k11 * p10)
+        P[1, 1] = p11 - (k10 * p01 + k11 * p11)
+
+        K = self.K_last
+        K[0, 0] = k00
+        K[0, 1] = k01
+        K[1, 0] = k10
+        K[1, 1] = k11
+
+        return y0, y1
+
     def predict(self) -> np.ndarray:
         """
         Fase de predição do filtro Kalman
 
+        Obsoleto: process_measurement usa step(), que funde
+        predição e atualização.
+
         Returns:
             Estado predito [Ψ, Γ]
         """
@@ -91,6 +242,9 @@ class AdaptiveKalmanCFC:
         """
         Fase de atualização do filtro Kalman
 
+        Obsoleto: process_measurement usa step(), que funde
+        predição e atualização.
+
         Args:
             measurement: Medição [Ψ_measured, Γ_measured]
 
@@ -126,19 +280,20 @@ class AdaptiveKalmanCFC:
         Args:
             innovation: Vetor de inovação
         """
-        # Calcula magnitude da inovação
-        inn_norm = np.linalg.norm(innovation)
+        # Magnitude² da inovação (compara com limiares ao quadrado, sem sqrt)
+        inn_sq = innovation[0] * innovation[0] + innovation[1] * innovation[1]
 
         # Adapta Q (ruído do processo)
-        if inn_norm > 0.5:
+        if inn_sq > 0.25:
             # Alta inovação → aumenta Q (mais incerteza no modelo)
             self.Q *= 1.1
-        elif inn_norm < 0.1:
+        elif inn_sq < 0.01:
             # Baixa inovação → reduz Q (modelo mais confiável)
             self.Q *= 0.9
 
-        # Limita Q para evitar instabilidade
-        self.Q = np.clip(self.Q, 1e-6, 1.0)
+        # Limita Q para evitar instabilidade (in-place, sem nova matriz)
+        np.maximum(self.Q, 1e-6, out=self.Q)
+        np.minimum(self.Q, 1.0, out=self.Q)
 
     def process_measurement(self,
                           psi_measured: float,
@@ -155,38 +310,22 @@ class AdaptiveKalmanCFC:
         """
         self.iteration += 1
 
-        # Fase de predição
-        x_pred = self.predict()
-
-        # Medição
-        z = np.array([psi_measured, gamma_measured])
-
-        # Inovação antes da atualização
-        innovation = z - self.H @ x_pred
-
-        # Fase de atualização
-        x_updated = self.update(z)
+        # Predição + atualização (retorna a inovação antes da atualização)
+        innovation = self.step(psi_measured, gamma_measured)
+        x_updated = self.x.copy()
 
         # Adaptação automática
         self.adapt_noise(innovation)
 
         # Salva estado no histórico
-        state = KalmanState(
-            x=x_updated.copy(),
-            P=self.P.copy(),
-            Q=self.Q.copy(),
-            R=self.R.copy(),
-            K=self.K_last.copy(),
-            iteration=self.iteration
-        )
-        self.history.append(state)
+        self._record_history()
 
         # Métricas
         metrics = {
             'iteration': self.iteration,
             'psi_estimated': float(x_updated[0]),
             'gamma_estimated': float(x_updated[1]),
-            'innovation_norm': float(np.linalg.norm(innovation)),
+            'innovation_norm': math.hypot(*innovation),
             'kalman_gain': float(np.mean(np.abs(self.K_last))),
             'covariance_trace': float(np.trace(self.P)),
             'process_noise': float(np.mean(np.diag(self.Q))),
@@ -195,8 +334,8 @@ class AdaptiveKalmanCFC:
 
         return x_updated, metrics
 
-    def calculate_correlation(self, psi_series: List[float],
-                            gamma_series: List[float]) -> float:
+    def calculate_correlation(self, psi_series: "ArrayLike",
+                            gamma_series: "ArrayLike") -> float:
         """
         Calcula correlação entre séries Ψ e Γ
 
@@ -207,8 +346,8 @@ class AdaptiveKalmanCFC:
         Returns:
             Coeficiente de correlação de Pearson
         """
-        psi_arr = np.array(psi_series)
-        gamma_arr = np.array(gamma_series)
+        psi_arr = np.asarray(psi_series)
+        gamma_arr = np.asarray(gamma_series)
 
         # Correlação de Pearson
         corr_matrix = np.corrcoef(psi_arr, gamma_arr)
@@ -241,59 +380,77 @@ class AdaptiveKalmanCFC:
         return float(fidelity)
 
     def optimize_cfc(self,
-                     psi_series: List[float],
-                     gamma_series: List[float],
+                     psi_series: "ArrayLike",
+                     gamma_series: "ArrayLike",
                      max_iterations: int = 50,
                      correlation_threshold: float = -0.95) -> Dict:
         """
         Otimização completa CFC (Coerência-Fidelidade-Correlação)
 
         Args:
-            psi_series: Série temporal de medições Ψ
-            gamma_series: Série temporal de medições Γ
+            psi_series: Série temporal de medições Ψ (lista ou ndarray 1-D)
+            gamma_series: Série temporal de medições Γ (lista ou ndarray 1-D)
             max_iterations: Número máximo de iterações
             correlation_threshold: Limiar de correlação desejado
 
         Returns:
             Dicionário com resultados da otimização
         """
-        if len(psi_series) != len(gamma_series):
+        # Sem cópia quando já é ndarray float64 contíguo
+        psi_arr = np.ascontiguousarray(psi_series, dtype=np.float64)
+        gamma_arr = np.ascontiguousarray(gamma_series, dtype=np.float64)
+
+        if psi_arr.ndim != 1 or gamma_arr.ndim != 1:
+            raise ValueError("psi_series e gamma_series devem ser unidimensionais")
+        if len(psi_arr) != len(gamma_arr):
             raise ValueError("psi_series e gamma_series devem ter o mesmo tamanho")
 
-        start_time = time.time()
+        start_ns = _perf_counter_ns()
 
         # Calcula correlação inicial
-        corr_initial = self.calculate_correlation(psi_series, gamma_series)
-
-        # Processa todas as medições
-        psi_filtered = []
-        gamma_filtered = []
-
-        for psi_m, gamma_m in zip(psi_series, gamma_series):
+        corr_initial = self.calculate_correlation(psi_arr, gamma_arr)
+
+        # Trajetória filtrada pré-alocada (medições + iterações extras)
+        n_samples = len(psi_arr)
+        psi_filtered = np.empty(max(n_samples, max_iterations))
+        gamma_filtered = np.empty_like(psi_filtered)
+
+        # Processa todas as medições (floats Python no loop escalar do filtro)
+        # A recursão é intrinsecamente sequencial: Q adapta com a inovação de
+        # cada passo (adapt_noise), então o filtro não é linear-gaussiano com
+        # parâmetros fixos e não admite scan associativo (prefix-sum) paralelo
+        # no eixo do tempo sem mudar o resultado. Para paralelizar, use
+        # batch_optimize_cfc sobre séries independentes.
+        psi_values = psi_arr.tolist()
+        gamma_values = gamma_arr.tolist()
+        for i, (psi_m, gamma_m) in enumerate(zip(psi_values, gamma_values)):
             x_est, metrics = self.process_measurement(psi_m, gamma_m)
-            psi_filtered.append(x_est[0])
-            gamma_filtered.append(x_est[1])
+            psi_filtered[i] = x_est[0]
+            gamma_filtered[i] = x_est[1]
 
         # Iterações adicionais para convergência
-        iterations = len(psi_series)
-        for _ in range(max_iterations - len(psi_series)):
+        iterations = n_samples
+        for _ in range(max_iterations - n_samples):
             # Usa últimas medições para continuar filtragem
-            x_est, _ = self.process_measurement(psi_series[-1], gamma_series[-1])
-            psi_filtered.append(x_est[0])
-            gamma_filtered.append(x_est[1])
+            x_est, _ = self.process_measurement(psi_values[-1], gamma_values[-1])
+            psi_filtered[iterations] = x_est[0]
+            gamma_filtered[iterations] = x_est[1]
             iterations += 1
 
             # Verifica convergência
-            if len(psi_filtered) >= 5:
+            if iterations >= 5:
                 recent_corr = self.calculate_correlation(
-                    psi_filtered[-5:],
-                    gamma_filtered[-5:]
+                    psi_filtered[iterations - 5:iterations],
+                    gamma_filtered[iterations - 5:iterations]
                 )
                 if recent_corr <= correlation_threshold:
                     break
 
         # Calcula correlação final
-        corr_final = self.calculate_correlation(psi_filtered, gamma_filtered)
+        corr_final = self.calculate_correlation(
+            psi_filtered[:iterations],
+            gamma_filtered[:iterations]
+        )
 
         # Calcula fidelidade
         fidelity = self.calculate_fidelity()
@@ -301,7 +458,7 @@ class AdaptiveKalmanCFC:
         # Calcula métricas CFC
         coerência = 1.0 - np.mean(np.diag(self.P))  # Baixa covariância = alta coerência
 
-        processing_time = (time.time() - start_time) * 1000  # ms
+        processing_time = (_perf_counter_ns() - start_ns) * 1e-6  # ms
 
         results = {
             'success': True,
@@ -320,6 +477,46 @@ class AdaptiveKalmanCFC:
 
         return results
 
+    @staticmethod
+    def batch_optimize_cfc(series_list: List[Tuple["ArrayLike", "ArrayLike"]],
+                           workers: Optional[int] = None,
+                           **kwargs) -> List[Dict]:
+        """
+        Otimização CFC de várias séries independentes, opcionalmente em paralelo
+
+        Cada par (Ψ, Γ) roda em um filtro novo. Por padrão as séries rodam
+        em série no processo atual: um filtro leva ~1 ms, menos que o spawn
+        de um pool, e forkar dentro de um servidor com threads não é seguro.
+        Com workers > 1, cada série roda em um processo separado; o
+        histórico de cada filtro fica no worker e não é agregado, apenas
+        os dicionários de resultado retornam.
+
+        Args:
+            series_list: Lista de pares (psi_series, gamma_series)
+            workers: Número de processos (padrão: 1, sem pool)
+            **kwargs: Repassados a optimize_cfc (max_iterations, etc)
+
+        Returns:
+            Lista de resultados na mesma ordem de series_list
+        """
+        if workers is None:
+            workers = 1
+
+        jobs = [(psi, gamma, kwargs) for psi, gamma in series_list]
+
+        # Sem ganho em paralelizar um único job: evita custo de spawn
+        if workers <= 1 or len(jobs) <= 1:
+            return [_run_optimize_cfc(job) for job in jobs]
+
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+            return list(pool.map(_run_optimize_cfc, jobs))
+
+
+def _run_optimize_cfc(job: Tuple["ArrayLike", "ArrayLike", Dict]) -> Dict:
+    """Executa optimize_cfc em um filtro novo (alvo picklável dos workers)"""
+    psi_series, gamma_series, kwargs = job
+    return AdaptiveKalmanCFC().optimize_cfc(psi_series, gamma_series, **kwargs)
+
 
 def demo_kalman_adaptive():
     """Demonstração do Filtro Kalman Adaptativo CFC"""
@@ -343,8 +540,8 @@ def demo_kalman_adaptive():
 
     # Executa otimização CFC
     results = kalman.optimize_cfc(
-        psi_measured.tolist(),
-        gamma_measured.tolist(),
+        psi_measured,
+        gamma_measured,
         max_iterations=50,
         correlation_threshold=-0.95
     )
@@ -0,0 +1 @@
+"""Integração unificada Ω-GATE"""
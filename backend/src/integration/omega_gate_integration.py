@@ -11,18 +11,105 @@ Version: 1.0.0
 Date: 2025-11-22
 """
 
+import logging
 import sys
 import time
-from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from time import perf_counter_ns as _perf_counter_ns
+from bisect import bisect_right
+from functools import lru_cache
+from operator import itemgetter
+from types import MappingProxyType
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
 import numpy as np
 
-# Adiciona diretório src ao path
-src_path = Path(__file__).parent.parent
-sys.path.insert(0, str(src_path))
+if TYPE_CHECKING:
+    from numpy.typing import ArrayLike
 
-from filters.kalman_cfc_adaptive import AdaptiveKalmanCFC
-from blockchain.pqc_signer import SPHINCSPlusSigner, PQCEvidenceNote
+from ..filters.kalman_cfc_adaptive import AdaptiveKalmanCFC
+from ..blockchain.pqc_signer import SPHINCSPlusSigner, PQCEvidenceNote
+
+logger = logging.getLogger(__name__)
+
+# Ordem fixa dos componentes do Ω-Score (pesos e features)
+_OMEGA_KEYS = ('psi', 'theta', 'cvar', 'pole', 'cog', 'trust')
+
+# Extrai de uma vez os campos de optimize_cfc usados em evidência e resultado
+_KALMAN_SUMMARY = itemgetter(
+    'correlation_initial', 'correlation_final', 'correlation_gain',
+    'fidelity', 'coherence', 'cfc_score', 'iterations', 'converged',
+    'processing_time_ms'
+)
+
+
+def _kalman_summary(kalman_results: Dict) -> Dict:
+    """
+    Resumo Kalman de uma auditoria, no schema de result['kalman']
+
+    O conteúdo assinado usa uma cópia própria (_kalman_evidence), com o
+    schema da evidência; alterar o resultado não altera a nota.
+    """
+    (corr_initial, corr_final, corr_gain, fidelity, coherence,
+     cfc_score, iterations, converged, kalman_ms) = _KALMAN_SUMMARY(kalman_results)
+
+    return {
+        'correlation_initial': corr_initial,
+        'correlation_final': corr_final,
+        'correlation_gain': corr_gain,
+        'fidelity_new': fidelity,
+        'coherence': coherence,
+        'cfc_score': cfc_score,
+        'iterations': iterations,
+        'converged': converged,
+        'processing_time_ms': kalman_ms
+    }
+
+
+def _kalman_evidence(kalman_summary: Dict) -> Dict:
+    """
+    Resultados Kalman do conteúdo assinado (evidence_content['kalman_results'])
+
+    Schema imutável da evidência: 'fidelity' (não 'fidelity_new') e sem
+    tempos; o tempo de processamento fica só no nível do conteúdo.
+    """
+    return {
+        'correlation_initial': kalman_summary['correlation_initial'],
+        'correlation_final': kalman_summary['correlation_final'],
+        'correlation_gain': kalman_summary['correlation_gain'],
+        'fidelity': kalman_summary['fidelity_new'],
+        'coherence': kalman_summary['coherence'],
+        'cfc_score': kalman_summary['cfc_score'],
+        'iterations': kalman_summary['iterations'],
+        'converged': kalman_summary['converged']
+    }
+
+
+@lru_cache(maxsize=None)
+def _omega_batch_kernel():
+    """
+    Kernel Ω-Score em lote compilado com numba (import e JIT sob demanda)
+
+    Returns:
+        Função kernel(psi, theta_ms, cvar, pole, cog, trust, w, out),
+        ou None se numba não estiver instalado
+    """
+    try:
+        from numba import njit
+    except ImportError:
+        return None
+
+    @njit(cache=True)
+    def kernel(psi, theta_ms, cvar, pole, cog, trust, w, out):
+        for i in range(psi.shape[0]):
+            theta_norm = 1.0 - (theta_ms[i] - 20.0) / 480.0
+            if theta_norm < 0.0:
+                theta_norm = 0.0
+            elif theta_norm > 1.0:
+                theta_norm = 1.0
+            out[i] = (w[0] * psi[i] + w[1] * theta_norm + w[2] * (1.0 - cvar[i]) +
+                      w[3] * pole[i] + w[4] * cog[i] + w[5] * trust[i])
+        return out
+
+    return kernel
 
 
 class OmegaGateProcessor:
@@ -35,6 +122,16 @@ class OmegaGateProcessor:
     - Governança Ω-GATE
     """
 
+    # Limiares de tier (limite inferior inclusivo) e nomes, do menor ao maior
+    _TIER_BOUNDS = (0.70, 0.85, 0.95)
+    _TIER_NAMES = (
+        "REVISÃO NECESSÁRIA",
+        "APROVADO (Standard)",
+        "VERDADE¹ (Premium)",
+        "VERDADE² (Elite)"
+    )
+    _APPROVAL_THRESHOLD = _TIER_BOUNDS[0]
+
     def __init__(self, security_level: int = 128):
         """
         Inicializa o processador Ω-GATE
@@ -47,15 +144,21 @@ class OmegaGateProcessor:
         self.pqc_signer = SPHINCSPlusSigner(security_level)
         self.evidence_system = PQCEvidenceNote(self.pqc_signer)
 
-        # Pesos do Ω-Score
-        self.omega_weights = {
-            'psi': 0.4,      # Qualidade semântica
-            'theta': 0.25,    # Performance
-            'cvar': 0.15,     # Risco
-            'pole': 0.08,     # Evolução
-            'cog': 0.05,      # Governança
-            'trust': 0.07     # Confiança
-        }
+        # Pesos do Ω-Score, na ordem de _OMEGA_KEYS:
+        # psi (qualidade semântica), theta (performance), cvar (risco),
+        # pole (evolução), cog (governança), trust (confiança)
+        self._omega_w = np.array([0.4, 0.25, 0.15, 0.08, 0.05, 0.07],
+                                 dtype=np.float64)
+        self._omega_w.flags.writeable = False
+
+        # Mesmos pesos como escalares Python (caminho escalar) e como
+        # mapeamento somente leitura (API pública), ambos derivados do array.
+        # A evidência recebe uma cópia em dict: o conteúdo assinado precisa
+        # continuar serializável (json, pickle, deepcopy).
+        self._omega_w_tuple = tuple(self._omega_w.tolist())
+        self.omega_weights = MappingProxyType(
+            dict(zip(_OMEGA_KEYS, self._omega_w_tuple))
+        )
 
     def calculate_omega_score(self,
                              psi: float,
@@ -82,51 +185,107 @@ class OmegaGateProcessor:
         """
         # Normaliza Θ (latência)
         # Assume 20ms = excelente (1.0), 500ms = ruim (0.0)
-        theta_norm = max(0, min(1, 1 - (theta_ms - 20) / 480))
+        theta_norm = 1.0 - (theta_ms - 20.0) / 480.0
+        if theta_norm < 0.0:
+            theta_norm = 0.0
+        elif theta_norm > 1.0:
+            theta_norm = 1.0
 
         # Calcula Ω
+        w_psi, w_theta, w_cvar, w_pole, w_cog, w_trust = self._omega_w_tuple
         omega = (
-            self.omega_weights['psi'] * psi +
-            self.omega_weights['theta'] * theta_norm +
-            self.omega_weights['cvar'] * (1 - cvar) +
-            self.omega_weights['pole'] * pole +
-            self.omega_weights['cog'] * cog +
-            self.omega_weights['trust'] * trust
+            w_psi * psi +
+            w_theta * theta_norm +
+            w_cvar * (1 - cvar) +
+            w_pole * pole +
+            w_cog * cog +
+            w_trust * trust
         )
 
         return float(omega)
 
+    def calculate_omega_scores(self,
+                               psi: np.ndarray,
+                               theta_ms: np.ndarray,
+                               cvar=0.01,
+                               pole=0.5,
+                               cog=0.8,
+                               trust=0.9) -> np.ndarray:
+        """
+        Versão vetorizada de calculate_omega_score para lotes
+
+        Cada argumento aceita array (N,) ou escalar (broadcast). Com numba
+        instalado, lotes 1-D usam um kernel compilado; sem ele, o cálculo
+        é feito com NumPy.
+
+        Returns:
+            Array (N,) de Ω-Scores
+        """
+        args = [np.asarray(arg, dtype=np.float64)
+                for arg in (psi, theta_ms, cvar, pole, cog, trust)]
+        shape = np.broadcast_shapes(*(arg.shape for arg in args))
+        psi, theta_ms, cvar, pole, cog, trust = (
+            arg if arg.shape == shape
+            else np.full(shape, arg) if arg.ndim == 0
+            else np.broadcast_to(arg, shape)
+            for arg in args
+        )
+
+        kernel = _omega_batch_kernel() if psi.ndim == 1 else None
+        if kernel is not None:
+            return kernel(psi, theta_ms, cvar, pole, cog, trust,
+                          self._omega_w, np.empty(psi.shape))
+
+        features = np.empty(psi.shape + (len(_OMEGA_KEYS),))
+        features[..., 0] = psi
+        features[..., 1] = np.clip(1.0 - (theta_ms - 20.0) / 480.0, 0.0, 1.0)
+        features[..., 2] = 1.0 - cvar
+        features[..., 3] = pole
+        features[..., 4] = cog
+        features[..., 5] = trust
+
+        return features @ self._omega_w
+
     def process_comprehensive_audit(self,
-                                   psi_series: List[float],
-                                   gamma_series: List[float],
-                                   context: Optional[Dict] = None) -> Dict:
+                                   psi_series: "ArrayLike",
+                                   gamma_series: "ArrayLike",
+                                   context: Optional[Dict] = None,
+                                   sign_rejected: bool = True) -> Dict:
         """
         Processa auditoria completa com Kalman + PQC + Ω-GATE
 
         Args:
-            psi_series: Série temporal de Ψ
-            gamma_series: Série temporal de Γ
+            psi_series: Série temporal de Ψ (lista ou ndarray 1-D)
+            gamma_series: Série temporal de Γ (lista ou ndarray 1-D)
             context: Contexto adicional da auditoria
+            sign_rejected: Se False, auditorias com Ω-Score abaixo do limiar
+                de aprovação retornam sem Evidence Note (evidence_note=None,
+                com 'rejection_reason'), pulando assinatura e validação PQC.
+                Para recurso, basta reprocessar com sign_rejected=True.
 
         Returns:
             Resultado completo da auditoria
         """
-        start_time = time.time()
+        start_ns = _perf_counter_ns()
 
         if context is None:
             context = {}
 
+        # Converte na fronteira (sem cópia se já for ndarray float64)
+        psi_arr = np.ascontiguousarray(psi_series, dtype=np.float64)
+        gamma_arr = np.ascontiguousarray(gamma_series, dtype=np.float64)
+
         # 1. FILTRO KALMAN - Otimização CFC
-        print("🧮 Executando Filtro Kalman Adaptativo...")
+        logger.debug("Executando Filtro Kalman Adaptativo...")
         kalman_results = self.kalman_filter.optimize_cfc(
-            psi_series,
-            gamma_series,
+            psi_arr,
+            gamma_arr,
             max_iterations=50,
             correlation_threshold=-0.95
         )
 
         # 2. CÁLCULO Ω-SCORE
-        print("🎯 Calculando Ω-Score...")
+        logger.debug("Calculando Ω-Score...")
 
         # Usa fidelidade do Kalman como Ψ
         psi_quality = kalman_results['fidelity']
@@ -146,62 +305,258 @@ class OmegaGateProcessor:
             trust=0.92  # Placeholder
         )
 
+        kalman_summary = _kalman_summary(kalman_results)
+
+        # Reprovada e sem evidência pedida: pula assinatura e validação PQC
+        if not sign_rejected and omega_score < self._APPROVAL_THRESHOLD:
+            logger.debug("Ω-Score abaixo do limiar; Evidence Note não gerado")
+            result = self._build_result(
+                kalman_summary, omega_score, psi_quality, theta_ms, cvar_risk,
+                None, False, '', start_ns
+            )
+            result['rejection_reason'] = (
+                f"Ω-Score {omega_score:.3f} abaixo do limiar de aprovação "
+                f"{self._APPROVAL_THRESHOLD:.2f}"
+            )
+            return result
+
+        return self._finalize_audit(kalman_summary, omega_score, psi_quality,
+                                    theta_ms, cvar_risk, context, start_ns)
+
+    def process_batch(self,
+                      list_of_psi: List["ArrayLike"],
+                      list_of_gamma: List["ArrayLike"],
+                      contexts: Optional[List[Optional[Dict]]] = None,
+                      workers: Optional[int] = None,
+                      aggregate_signature: bool = False) -> List[Dict]:
+        """
+        Processa várias auditorias independentes em lote
+
+        Kalman roda um filtro novo por série (via
+        AdaptiveKalmanCFC.batch_optimize_cfc) e os Ω-Scores saem de uma
+        única chamada vetorizada. Diferente de process_comprehensive_audit,
+        o estado do self.kalman_filter não é carregado entre as séries.
+
+        Args:
+            list_of_psi: Séries temporais de Ψ, uma por auditoria
+            list_of_gamma: Séries temporais de Γ, uma por auditoria
+            contexts: Contexto de cada auditoria (opcional)
+            workers: Processos para o Kalman (padrão: 1, em série; use > 1
+                só para lotes longos fora de servidores com threads)
+            aggregate_signature: Assina o lote com uma única assinatura PQC
+                sobre a raiz Merkle das evidências (ver process_batch_signed)
+
+        Returns:
+            Lista de resultados no mesmo formato de process_comprehensive_audit
+        """
+        n_audits = len(list_of_psi)
+        if len(list_of_gamma) != n_audits:
+            raise ValueError("list_of_psi e list_of_gamma devem ter o mesmo tamanho")
+        if contexts is None:
+            contexts = [None] * n_audits
+        elif len(contexts) != n_audits:
+            raise ValueError("contexts deve ter uma entrada por auditoria")
+
+        # 1. FILTRO KALMAN - uma otimização CFC por série
+        all_kalman_results = AdaptiveKalmanCFC.batch_optimize_cfc(
+            list(zip(list_of_psi, list_of_gamma)),
+            workers=workers,
+            max_iterations=50,
+            correlation_threshold=-0.95
+        )
+
+        # 2. CÁLCULO Ω-SCORE - vetorizado sobre o lote
+        psi_quality = np.array([k['fidelity'] for k in all_kalman_results])
+        theta_ms = np.array([k['processing_time_ms'] for k in all_kalman_results])
+        cvar_risk = 1.0 - np.array([k['coherence'] for k in all_kalman_results])
+
+        omega_scores = self.calculate_omega_scores(
+            psi_quality, theta_ms, cvar_risk,
+            pole=0.65,  # Placeholder
+            cog=0.85,   # Placeholder
+            trust=0.92  # Placeholder
+        )
+
+        audits = [
+            (_kalman_summary(kalman_results), float(omega_scores[i]),
+             float(psi_quality[i]), float(theta_ms[i]), float(cvar_risk[i]),
+             contexts[i] if contexts[i] is not None else {})
+            for i, kalman_results in enumerate(all_kalman_results)
+        ]
+
+        if not aggregate_signature:
+            # 3-5. Evidence Note + resultado, por auditoria
+            results = []
+            for audit in audits:
+                # Tempo total = Kalman (no worker) + finalização local
+                kalman_ns = int(audit[0]['processing_time_ms'] * 1e6)
+                start_ns = _perf_counter_ns() - kalman_ns
+                results.append(self._finalize_audit(*audit, start_ns))
+            return results
+
+        # 3. ASSINATURA PQC agregada - uma assinatura para o lote
+        finalize_start_ns = _perf_counter_ns()
+        evidence_notes = self.process_batch_signed(
+            [self._build_evidence_content(*audit) for audit in audits]
+        )
+
+        # 4. VALIDAÇÃO PQC (caminho Merkle de cada nota; raiz verificada uma vez)
+        validations = self.evidence_system.verify_evidence_batch(evidence_notes)
+
+        # 5. RESULTADOS - finalização do lote rateada entre as auditorias
+        finalize_share_ns = (_perf_counter_ns() - finalize_start_ns) // max(n_audits, 1)
+        return [
+            self._build_result(
+                *audit[:5], note, is_valid, validation_msg,
+                _perf_counter_ns() - finalize_share_ns
+                - int(audit[0]['processing_time_ms'] * 1e6)
+            )
+            for audit, note, (is_valid, validation_msg)
+            in zip(audits, evidence_notes, validations)
+        ]
+
+    def process_batch_signed(self,
+                             list_of_contents: List[Dict],
+                             evidence_type: str = "COMPREHENSIVE_AUDIT") -> List[Dict]:
+        """
+        Gera Evidence Notes para vários conteúdos com uma única assinatura PQC
+
+        A assinatura cobre a raiz de uma árvore Merkle sobre os hashes das
+        notas; cada nota carrega seu caminho de inclusão em 'merkle_proof'
+        e é verificável isoladamente por evidence_system.verify_evidence.
+
+        Args:
+            list_of_contents: Conteúdos das evidências
+            evidence_type: Tipo de evidência
+
+        Returns:
+            Evidence Notes na mesma ordem de list_of_contents
+        """
+        return self.evidence_system.create_evidence_batch(
+            list_of_contents,
+            evidence_type=evidence_type
+        )
+
+    def verify_evidence_batch(self, evidence_notes: List[Dict]) -> np.ndarray:
+        """
+        Verifica vários Evidence Notes (replay de auditorias, atestação de blocos)
+
+        Cada assinatura distinta é verificada uma única vez; notas de um
+        mesmo lote assinado só refazem seu caminho Merkle.
+
+        Args:
+            evidence_notes: Evidence Notes a serem verificados
+
+        Returns:
+            Array booleano com a validade de cada nota, na mesma ordem
+        """
+        validations = self.evidence_system.verify_evidence_batch(evidence_notes)
+        return np.fromiter((is_valid for is_valid, _ in validations),
+                           dtype=bool, count=len(validations))
+
+    def _finalize_audit(self,
+                        kalman_summary: Dict,
+                        omega_score: float,
+                        psi_quality: float,
+                        theta_ms: float,
+                        cvar_risk: float,
+                        context: Dict,
+                        start_ns: int) -> Dict:
+        """
+        Etapas 3-5 da auditoria: Evidence Note PQC, validação e resultado
+
+        Returns:
+            Resultado completo da auditoria
+        """
         # 3. ASSINATURA PQC - Evidence Note
-        print("🛡️ Gerando Evidence Note com assinatura PQC...")
+        logger.debug("Gerando Evidence Note com assinatura PQC...")
+
+        evidence_content = self._build_evidence_content(
+            kalman_summary, omega_score, psi_quality, theta_ms, cvar_risk, context
+        )
+
+        # Serializa o conteúdo uma vez para ID e assinatura; a validação
+        # re-serializa a partir da própria nota
+        content_bytes = self.evidence_system.serialize_content(evidence_content)
 
-        evidence_content = {
+        evidence_note = self.evidence_system.create_evidence(
+            evidence_content,
+            evidence_type="COMPREHENSIVE_AUDIT",
+            content_bytes=content_bytes
+        )
+
+        # 4. VALIDAÇÃO PQC
+        logger.debug("Validando Evidence Note...")
+        is_valid, validation_msg = self.evidence_system.verify_evidence(evidence_note)
+
+        # 5. RESULTADO UNIFICADO
+        return self._build_result(
+            kalman_summary, omega_score, psi_quality, theta_ms, cvar_risk,
+            evidence_note, is_valid, validation_msg, start_ns
+        )
+
+    def _build_evidence_content(self,
+                                kalman_summary: Dict,
+                                omega_score: float,
+                                psi_quality: float,
+                                theta_ms: float,
+                                cvar_risk: float,
+                                context: Dict) -> Dict:
+        """Conteúdo assinado do Evidence Note de uma auditoria"""
+        return {
             'audit_type': 'comprehensive_kalman_cfc',
-            'kalman_results': {
-                'correlation_initial': kalman_results['correlation_initial'],
-                'correlation_final': kalman_results['correlation_final'],
-                'correlation_gain': kalman_results['correlation_gain'],
-                'fidelity': kalman_results['fidelity'],
-                'coherence': kalman_results['coherence'],
-                'cfc_score': kalman_results['cfc_score'],
-                'iterations': kalman_results['iterations'],
-                'converged': kalman_results['converged']
-            },
+            'kalman_results': _kalman_evidence(kalman_summary),
             'omega_gate': {
                 'omega_score': omega_score,
                 'psi_quality': psi_quality,
                 'theta_latency_ms': theta_ms,
                 'cvar_risk': cvar_risk,
-                'weights': self.omega_weights
+                'weights': dict(self.omega_weights)
             },
             'context': context,
-            'processing_time_ms': kalman_results['processing_time_ms']
+            'processing_time_ms': kalman_summary['processing_time_ms']
         }
 
-        evidence_note = self.evidence_system.create_evidence(
-            evidence_content,
-            evidence_type="COMPREHENSIVE_AUDIT"
-        )
-
-        # 4. VALIDAÇÃO PQC
-        print("✅ Validando Evidence Note...")
-        is_valid, validation_msg = self.evidence_system.verify_evidence(evidence_note)
+    def _build_result(self,
+                      kalman_summary: Dict,
+                      omega_score: float,
+                      psi_quality: float,
+                      theta_ms: float,
+                      cvar_risk: float,
+                      evidence_note: Optional[Dict],
+                      is_valid: bool,
+                      validation_msg: str,
+                      start_ns: int) -> Dict:
+        """Resultado unificado de uma auditoria (evidence_note=None: sem PQC)"""
+        converged = kalman_summary['converged']
+        kalman_ms = kalman_summary['processing_time_ms']
+        approved = omega_score >= self._APPROVAL_THRESHOLD
+
+        if evidence_note is None:
+            audit_id, timestamp, evidence = None, time.time(), None
+        else:
+            pqc_signature = evidence_note['pqc_signature']
+            audit_id, timestamp = evidence_note['id'], evidence_note['timestamp']
+            evidence = {
+                'id': audit_id,
+                'pqc_signature': pqc_signature['signature'],
+                'public_key': pqc_signature['public_key'],
+                'algorithm': pqc_signature['algorithm'],
+                'verified': is_valid,
+                'verification_msg': validation_msg,
+                'verification_url': evidence_note['verification_url']
+            }
 
         # Tempo total de processamento
-        total_time_ms = (time.time() - start_time) * 1000
+        total_time_ms = (_perf_counter_ns() - start_ns) * 1e-6
 
-        # 5. RESULTADO UNIFICADO
         result = {
             'success': True,
-            'audit_id': evidence_note['id'],
-            'timestamp': evidence_note['timestamp'],
+            'audit_id': audit_id,
+            'timestamp': timestamp,
 
             # Resultados Kalman
-            'kalman': {
-                'correlation_initial': kalman_results['correlation_initial'],
-                'correlation_final': kalman_results['correlation_final'],
-                'correlation_gain': kalman_results['correlation_gain'],
-                'fidelity_new': kalman_results['fidelity'],
-                'coherence': kalman_results['coherence'],
-                'cfc_score': kalman_results['cfc_score'],
-                'iterations': kalman_results['iterations'],
-                'converged': kalman_results['converged'],
-                'processing_time_ms': kalman_results['processing_time_ms']
-            },
+            'kalman': kalman_summary,
 
             # Ω-GATE Governance
             'omega_gate': {
@@ -209,38 +564,26 @@ class OmegaGateProcessor:
                 'psi_quality': psi_quality,
                 'theta_latency_ms': theta_ms,
                 'cvar_risk': cvar_risk,
-                'approved': omega_score >= 0.7,
+                'approved': approved,
                 'tier': self._get_omega_tier(omega_score)
             },
 
             # Evidence Note + PQC
-            'evidence_note': {
-                'id': evidence_note['id'],
-                'pqc_signature': evidence_note['pqc_signature']['signature'],
-                'public_key': evidence_note['pqc_signature']['public_key'],
-                'algorithm': evidence_note['pqc_signature']['algorithm'],
-                'verified': is_valid,
-                'verification_msg': validation_msg,
-                'verification_url': evidence_note['verification_url']
-            },
+            'evidence_note': evidence,
 
             # Métricas de Performance
             'performance': {
                 'total_time_ms': total_time_ms,
-                'kalman_time_ms': kalman_results['processing_time_ms'],
-                'overhead_ms': total_time_ms - kalman_results['processing_time_ms']
+                'kalman_time_ms': kalman_ms,
+                'overhead_ms': total_time_ms - kalman_ms
             },
 
             # Validação Final
             'validation': {
-                'kalman_converged': kalman_results['converged'],
-                'omega_approved': omega_score >= 0.7,
+                'kalman_converged': converged,
+                'omega_approved': approved,
                 'pqc_verified': is_valid,
-                'checks_passed': sum([
-                    kalman_results['converged'],
-                    omega_score >= 0.7,
-                    is_valid
-                ]),
+                'checks_passed': sum([converged, approved, is_valid]),
                 'total_checks': 3
             }
         }
@@ -257,14 +600,10 @@ class OmegaGateProcessor:
         Returns:
             Nome do tier
         """
-        if omega_score >= 0.95:
-            return "VERDADE² (Elite)"
-        elif omega_score >= 0.85:
-            return "VERDADE¹ (Premium)"
-        elif omega_score >= 0.70:
-            return "APROVADO (Standard)"
-        else:
-            return "REVISÃO NECESSÁRIA"
+        # Abaixo do primeiro limiar ou NaN (bisect mandaria NaN ao topo)
+        if not omega_score >= self._TIER_BOUNDS[0]:
+            return self._TIER_NAMES[0]
+        return self._TIER_NAMES[bisect_right(self._TIER_BOUNDS, omega_score)]
 
 
 def demo_integration():
@@ -276,11 +615,13 @@ def demo_integration():
     processor = OmegaGateProcessor(security_level=128)
 
     # Dados de teste: Ψ e Γ anticorrelacionados
-    np.random.seed(42)
+    rng = np.random.default_rng(42)
     n_samples = 15
 
-    psi_series = np.linspace(-0.8, 1.2, n_samples) + np.random.normal(0, 0.1, n_samples)
-    gamma_series = -psi_series + np.random.normal(0, 0.15, n_samples)
+    psi_series = np.linspace(-0.8, 1.2, n_samples)
+    psi_series += 0.1 * rng.standard_normal(n_samples)
+    gamma_series = 0.15 * rng.standard_normal(n_samples)
+    gamma_series -= psi_series
 
     # Contexto da auditoria
     context = {
@@ -292,65 +633,64 @@ def demo_integration():
 
     # Executa auditoria completa
     result = processor.process_comprehensive_audit(
-        psi_series.tolist(),
-        gamma_series.tolist(),
+        psi_series,
+        gamma_series,
         context=context
     )
 
-    # Exibe resultados
-    print("\n📊 RESULTADOS DA AUDITORIA COMPLETA:")
-    print(f"✅ Sucesso: {result['success']}")
-    print(f"🆔 Audit ID: {result['audit_id']}")
-    print()
-
-    print("🧮 KALMAN CFC:")
+    # Exibe resultados (monta o relatório e escreve de uma vez)
     k = result['kalman']
-    print(f"  📈 Correlação inicial: {k['correlation_initial']:.3f}")
-    print(f"  🎯 Correlação final: {k['correlation_final']:.3f}")
-    print(f"  🚀 Ganho: {k['correlation_gain']:.3f}")
-    print(f"  ⚛️ Fidelidade: {k['fidelity_new']:.6f}")
-    print(f"  🌀 Coerência: {k['coherence']:.6f}")
-    print(f"  🏆 CFC Score: {k['cfc_score']:.6f}")
-    print(f"  🔄 Iterações: {k['iterations']}")
-    print(f"  ✔️ Convergiu: {k['converged']}")
-    print()
-
-    print("🎯 Ω-GATE GOVERNANCE:")
     o = result['omega_gate']
-    print(f"  🌟 Ω-Score: {o['omega_score']:.3f}")
-    print(f"  📊 Ψ Quality: {o['psi_quality']:.3f}")
-    print(f"  ⏱️ Θ Latency: {o['theta_latency_ms']:.1f}ms")
-    print(f"  ⚠️ CVaR Risk: {o['cvar_risk']:.3f}")
-    print(f"  ✅ Aprovado: {o['approved']}")
-    print(f"  🏆 Tier: {o['tier']}")
-    print()
-
-    print("🛡️ EVIDENCE NOTE + PQC:")
     e = result['evidence_note']
-    print(f"  🆔 Evidence ID: {e['id']}")
-    print(f"  🔐 PQC Signature: {e['pqc_signature'][:32]}...")
-    print(f"  🔑 Public Key: {e['public_key'][:32]}...")
-    print(f"  🛡️ Algorithm: {e['algorithm']}")
-    print(f"  ✅ Verificado: {e['verified']}")
-    print(f"  📋 {e['verification_msg']}")
-    print()
-
-    print("⚡ PERFORMANCE:")
     p = result['performance']
-    print(f"  ⏱️ Tempo total: {p['total_time_ms']:.1f}ms")
-    print(f"  🧮 Kalman: {p['kalman_time_ms']:.1f}ms")
-    print(f"  📦 Overhead: {p['overhead_ms']:.1f}ms")
-    print()
-
-    print("✅ VALIDAÇÃO FINAL:")
     v = result['validation']
-    print(f"  🔍 Checks passados: {v['checks_passed']}/{v['total_checks']}")
-    print(f"  ✔️ Kalman convergiu: {v['kalman_converged']}")
-    print(f"  ✔️ Ω aprovado: {v['omega_approved']}")
-    print(f"  ✔️ PQC verificado: {v['pqc_verified']}")
-
-    print("\n" + "=" * 80)
-    print("🎉 AUDITORIA COMPLETA FINALIZADA COM SUCESSO!")
+    report = [
+        "",
+        "📊 RESULTADOS DA AUDITORIA COMPLETA:",
+        f"✅ Sucesso: {result['success']}",
+        f"🆔 Audit ID: {result['audit_id']}",
+        "",
+        "🧮 KALMAN CFC:",
+        f"  📈 Correlação inicial: {k['correlation_initial']:.3f}",
+        f"  🎯 Correlação final: {k['correlation_final']:.3f}",
+        f"  🚀 Ganho: {k['correlation_gain']:.3f}",
+        f"  ⚛️ Fidelidade: {k['fidelity_new']:.6f}",
+        f"  🌀 Coerência: {k['coherence']:.6f}",
+        f"  🏆 CFC Score: {k['cfc_score']:.6f}",
+        f"  🔄 Iterações: {k['iterations']}",
+        f"  ✔️ Convergiu: {k['converged']}",
+        "",
+        "🎯 Ω-GATE GOVERNANCE:",
+        f"  🌟 Ω-Score: {o['omega_score']:.3f}",
+        f"  📊 Ψ Quality: {o['psi_quality']:.3f}",
+        f"  ⏱️ Θ Latency: {o['theta_latency_ms']:.1f}ms",
+        f"  ⚠️ CVaR Risk: {o['cvar_risk']:.3f}",
+        f"  ✅ Aprovado: {o['approved']}",
+        f"  🏆 Tier: {o['tier']}",
+        "",
+        "🛡️ EVIDENCE NOTE + PQC:",
+        f"  🆔 Evidence ID: {e['id']}",
+        f"  🔐 PQC Signature: {e['pqc_signature'][:32]}...",
+        f"  🔑 Public Key: {e['public_key'][:32]}...",
+        f"  🛡️ Algorithm: {e['algorithm']}",
+        f"  ✅ Verificado: {e['verified']}",
+        f"  📋 {e['verification_msg']}",
+        "",
+        "⚡ PERFORMANCE:",
+        f"  ⏱️ Tempo total: {p['total_time_ms']:.1f}ms",
+        f"  🧮 Kalman: {p['kalman_time_ms']:.1f}ms",
+        f"  📦 Overhead: {p['overhead_ms']:.1f}ms",
+        "",
+        "✅ VALIDAÇÃO FINAL:",
+        f"  🔍 Checks passados: {v['checks_passed']}/{v['total_checks']}",
+        f"  ✔️ Kalman convergiu: {v['kalman_converged']}",
+        f"  ✔️ Ω aprovado: {v['omega_approved']}",
+        f"  ✔️ PQC verificado: {v['pqc_verified']}",
+        "",
+        "=" * 80,
+        "🎉 AUDITORIA COMPLETA FINALIZADA COM SUCESSO!",
+    ]
+    sys.stdout.write("\n".join(report) + "\n")
 
 
 if __name__ == "__main__":
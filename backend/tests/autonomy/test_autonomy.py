@@ -20,6 +20,7 @@ from pathlib import Path
 backend_path = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(backend_path))
 
+import threading
 import time
 import pytest
 from autonomy.kalman_policy import (
@@ -39,6 +40,37 @@ from autonomy.decision_engine import (
 from autonomy.actuator import K8sActuator
 
 
+def _wait_for(predicate, timeout: float = 2.0) -> bool:
+    """Espera até predicate() ser verdadeiro (estado observável de um loop em background)"""
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(0.005)
+    return True
+
+
+# === FIXTURES ===
+
+@pytest.fixture(scope="module")
+def shared_collector():
+    """Um MatVerseMetricsCollector para o módulo inteiro"""
+    return MatVerseMetricsCollector()
+
+
+@pytest.fixture
+def collector(shared_collector):
+    """Coletor compartilhado, resetado para o estado inicial a cada teste"""
+    shared_collector.reset()
+    return shared_collector
+
+
+@pytest.fixture
+def engine(collector):
+    """DecisionEngine novo sobre o coletor resetado"""
+    return DecisionEngine(collector)
+
+
 # === TESTES KALMAN POLICY PREDICTOR ===
 
 class TestKalmanPolicyPredictor:
@@ -115,6 +147,27 @@ class TestKalmanPolicyPredictor:
         # Q deve ter mudado
         assert not (predictor.Q == Q_initial).all()
 
+    def test_predict_batch_matches_sequential(self):
+        """Testa predict_batch equivalente a predict() estado a estado"""
+        states = [
+            SystemState(0.9, 0.95, 1.2 - i * 0.08, 0.2 + (i % 7) * 0.12,
+                        30 + (i % 5) * 50, 1000)
+            for i in range(30)
+        ]
+
+        sequential = KalmanPolicyPredictor()
+        batch = KalmanPolicyPredictor()
+
+        expected = [sequential.predict(state) for state in states]
+        actions, predictions = batch.predict_batch(states)
+
+        assert actions == [action for action, _ in expected]
+        for (_, pred_seq), pred_batch in zip(expected, predictions):
+            assert pred_batch.confidence == pytest.approx(pred_seq.confidence)
+            assert pred_batch.reasoning == pred_seq.reasoning
+        assert batch.x == pytest.approx(sequential.x)
+        assert len(batch.state_history) == len(sequential.state_history)
+
 
 # === TESTES METRICS COLLECTOR ===
 
@@ -187,10 +240,11 @@ class TestMetricsCollector:
         collector = MetricsCollector(collection_interval=0.1)
         collector.start_auto_collection()
 
-        time.sleep(0.3)
+        # Pelo menos uma coleta
+        assert _wait_for(lambda: collector.get_metric_history("system_cpu_usage"))
 
         cpu = collector.get_current_value("system_cpu_usage")
-        assert cpu >= 0  # Pelo menos uma coleta deve ter ocorrido
+        assert cpu >= 0
 
         collector.stop_auto_collection()
 
@@ -198,19 +252,16 @@ class TestMetricsCollector:
 class TestMatVerseMetricsCollector:
     """Testes do MatVerseMetricsCollector"""
 
-    def test_initialization_with_matverse_metrics(self):
+    def test_initialization_with_matverse_metrics(self, collector):
         """Testa inicialização com métricas MatVerse"""
-        collector = MatVerseMetricsCollector()
-
         omega = collector.get_current_value("omega_score_current")
         quantum_states = collector.get_current_value("quantum_states_count")
 
         assert omega == 0.0  # Valor inicial
         assert quantum_states == 46080
 
-    def test_update_matverse_metrics(self):
+    def test_update_matverse_metrics(self, collector):
         """Testa atualização de métricas MatVerse"""
-        collector = MatVerseMetricsCollector()
         collector.update_matverse_metrics(0.95, 0.97, 1.2, 50.0, 1500.0)
 
         omega = collector.get_current_value("omega_score_current")
@@ -227,32 +278,25 @@ class TestMatVerseMetricsCollector:
 class TestDecisionEngine:
     """Testes do DecisionEngine"""
 
-    def test_initialization(self):
+    def test_initialization(self, engine):
         """Testa inicialização"""
-        collector = MatVerseMetricsCollector()
-        engine = DecisionEngine(collector)
-
         assert engine.mode == DecisionMode.BALANCED
         assert engine.min_confidence == 0.70
 
-    def test_make_decision(self):
+    def test_make_decision(self, collector, engine):
         """Testa tomada de decisão"""
-        collector = MatVerseMetricsCollector()
         collector.update_matverse_metrics(0.95, 0.97, 1.2, 50.0, 1500.0)
 
-        engine = DecisionEngine(collector)
         decision = engine.make_decision()
 
         assert decision.action in Action
         assert 0 <= decision.confidence <= 1
         assert decision.processing_time_ms < 100  # Target: <50ms
 
-    def test_decision_performance(self):
+    def test_decision_performance(self, collector, engine):
         """Testa performance do loop OODA"""
-        collector = MatVerseMetricsCollector()
         collector.update_matverse_metrics(0.95, 0.97, 1.2, 50.0, 1500.0)
 
-        engine = DecisionEngine(collector)
         decision = engine.make_decision()
 
         # Targets: Observe <10ms, Orient <50ms, Decide <50ms
@@ -261,9 +305,8 @@ class TestDecisionEngine:
         assert decision.decide_time_ms < 50
         assert decision.processing_time_ms < 200  # Total
 
-    def test_decision_modes(self):
+    def test_decision_modes(self, collector):
         """Testa diferentes modos de decisão"""
-        collector = MatVerseMetricsCollector()
         collector.update_matverse_metrics(0.85, 0.90, 1.1, 0.65, 85.0, 1800.0)
 
         # Conservative
@@ -279,11 +322,8 @@ class TestDecisionEngine:
         assert decision_conservative.mode == DecisionMode.CONSERVATIVE
         assert decision_aggressive.mode == DecisionMode.AGGRESSIVE
 
-    def test_decision_history(self):
+    def test_decision_history(self, collector, engine):
         """Testa histórico de decisões"""
-        collector = MatVerseMetricsCollector()
-        engine = DecisionEngine(collector)
-
         for _ in range(5):
             collector.update_matverse_metrics(0.95, 0.97, 1.2, 50.0, 1500.0)
             engine.make_decision()
@@ -291,15 +331,25 @@ class TestDecisionEngine:
         history = engine.get_decision_history()
         assert len(history) == 5
 
-    def test_action_callback(self):
-        """Testa callbacks de ação"""
-        collector = MatVerseMetricsCollector()
-        engine = DecisionEngine(collector)
+    def test_make_decisions_batch(self, engine):
+        """Testa decisões em lote"""
+        states = [SystemState(0.90 + (i % 10) / 100, 0.95, 1.2, 0.5, 50.0, 1500.0)
+                  for i in range(100)]
+        decisions = engine.make_decisions(states)
+
+        assert len(decisions) == 100
+        assert len(engine.get_decision_history()) == 100
+        assert engine.get_last_decision() is decisions[-1]
+        assert all(d.system_state is s for d, s in zip(decisions, states))
 
+    def test_action_callback(self, collector, engine):
+        """Testa callbacks de ação"""
         callback_executed = []
+        done = threading.Event()
 
         def test_callback(decision):
             callback_executed.append(decision.action)
+            done.set()
 
         engine.register_action_callback(Action.SCALE_UP, test_callback)
 
@@ -307,11 +357,11 @@ class TestDecisionEngine:
         collector.update_matverse_metrics(0.92, 0.95, 1.15, 0.85, 180, 2500)
         engine.start_autonomous_loop()
 
-        time.sleep(1.5)  # Aguarda decisão
+        executed = done.wait(timeout=2.0)  # Aguarda o callback
         engine.stop_autonomous_loop()
 
-        # Pelo menos uma decisão deve ter sido tomada
-        assert len(engine.decision_history) > 0
+        assert executed
+        assert Action.SCALE_UP in callback_executed
 
 
 # === TESTES K8S ACTUATOR ===
@@ -429,22 +479,20 @@ class TestIntegration:
         engine.start_autonomous_loop()
 
         # Aguarda decisão
-        time.sleep(1.0)
+        decided = _wait_for(lambda: engine.get_last_decision() is not None)
 
         # Para
         engine.stop_autonomous_loop()
         collector.stop_auto_collection()
 
         # Verificações
+        assert decided
         assert len(engine.decision_history) > 0
         last_decision = engine.get_last_decision()
         assert last_decision is not None
 
-    def test_performance_under_load(self):
+    def test_performance_under_load(self, collector, engine):
         """Testa performance sob carga"""
-        collector = MatVerseMetricsCollector()
-        engine = DecisionEngine(collector)
-
         # 100 decisões rápidas
         start = time.time()
 
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Test Suite - PQC Evidence Notes em lote
+
+Testes da assinatura agregada por árvore Merkle:
+- _merkle_tree / _merkle_fold
+- PQCEvidenceNote.create_evidence_batch
+- PQCEvidenceNote.verify_evidence_batch
+
+Author: MatVerse Team
+Version: 1.0.0
+Date: 2025-11-22
+"""
+
+import copy
+import sys
+from pathlib import Path
+
+# Adiciona backend ao path
+backend_path = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_path))
+
+import pytest
+from src.blockchain.pqc_signer import (
+    SPHINCSPlusSigner,
+    PQCEvidenceNote,
+    _merkle_tree,
+    _merkle_fold,
+    _merkle_leaf,
+    _merkle_node
+)
+
+
+# Tamanhos ímpares e pares, incluindo níveis que duplicam o último nó
+BATCH_SIZES = [1, 2, 3, 4, 5, 7, 8]
+
+
+# === FIXTURES ===
+
+@pytest.fixture(scope="module")
+def evidence_system():
+    """Um PQCEvidenceNote (par de chaves) para o módulo inteiro"""
+    return PQCEvidenceNote(SPHINCSPlusSigner())
+
+
+def _contents(n):
+    """Conteúdos distintos para um lote de n notas"""
+    return [{'audit': i, 'omega_score': 0.9 + i / 1000} for i in range(n)]
+
+
+# === TESTES ÁRVORE MERKLE ===
+
+class TestMerkleTree:
+    """Testes de _merkle_tree e _merkle_fold"""
+
+    @pytest.mark.parametrize("n_leaves", BATCH_SIZES)
+    def test_paths_fold_to_root(self, n_leaves):
+        """Cada caminho reconstrói a raiz a partir da sua folha"""
+        leaves = [_merkle_leaf(bytes([i])) for i in range(n_leaves)]
+        root, paths = _merkle_tree(leaves)
+
+        assert len(paths) == n_leaves
+        for leaf, path in zip(leaves, paths):
+            assert _merkle_fold(leaf, path) == root
+
+    @pytest.mark.parametrize("n_leaves", BATCH_SIZES)
+    def test_path_sides_encode_leaf_index(self, n_leaves):
+        """O lado de cada irmão é o bit correspondente do índice da folha"""
+        leaves = [_merkle_leaf(bytes([i])) for i in range(n_leaves)]
+        _, paths = _merkle_tree(leaves)
+
+        for index, path in enumerate(paths):
+            sides = [side for _, side in path]
+            expected = ['L' if (index >> level) & 1 else 'R'
+                        for level in range(len(path))]
+            assert sides == expected
+
+    def test_odd_level_duplicates_last_node(self):
+        """Com 3 folhas, a terceira é pareada com ela mesma"""
+        leaves = [_merkle_leaf(bytes([i])) for i in range(3)]
+        root, paths = _merkle_tree(leaves)
+
+        expected = _merkle_node(_merkle_node(leaves[0], leaves[1]),
+                                _merkle_node(leaves[2], leaves[2]))
+        assert root == expected
+        assert paths[2][0] == [leaves[2].hex(), 'R']
+
+    def test_single_leaf_is_root(self):
+        """Uma única folha é a própria raiz, com caminho vazio"""
+        leaf = _merkle_leaf(b"only")
+        root, paths = _merkle_tree([leaf])
+
+        assert root == leaf
+        assert paths == [[]]
+
+    def test_wrong_leaf_does_not_fold_to_root(self):
+        """Outra folha com o mesmo caminho não reconstrói a raiz"""
+        leaves = [_merkle_leaf(bytes([i])) for i in range(4)]
+        root, paths = _merkle_tree(leaves)
+
+        assert _merkle_fold(leaves[1], paths[0]) != root
+
+
+# === TESTES EVIDENCE NOTES EM LOTE ===
+
+class TestEvidenceBatch:
+    """Testes de create_evidence_batch e verify_evidence_batch"""
+
+    def test_empty_batch(self, evidence_system):
+        """Lote vazio não assina nada"""
+        assert evidence_system.create_evidence_batch([]) == []
+        assert evidence_system.verify_evidence_batch([]) == []
+
+    @pytest.mark.parametrize("n_notes", BATCH_SIZES)
+    def test_batch_notes_verify(self, evidence_system, n_notes):
+        """Cada nota do lote verifica isoladamente e em lote"""
+        contents = _contents(n_notes)
+        notes = evidence_system.create_evidence_batch(contents)
+
+        assert [note['content'] for note in notes] == contents
+        for note in notes:
+            is_valid, _ = evidence_system.verify_evidence(note)
+            assert is_valid
+        assert all(is_valid for is_valid, _ in
+                   evidence_system.verify_evidence_batch(notes))
+
+    @pytest.mark.parametrize("n_notes", BATCH_SIZES)
+    def test_shared_root_and_leaf_index(self, evidence_system, n_notes):
+        """Notas compartilham raiz e assinatura; leaf_index segue a ordem"""
+        notes = evidence_system.create_evidence_batch(_contents(n_notes))
+
+        roots = {note['merkle_proof']['root'] for note in notes}
+        signatures = {note['pqc_signature']['signature'] for note in notes}
+        assert len(roots) == 1
+        assert len(signatures) == 1
+        assert [note['merkle_proof']['leaf_index'] for note in notes] == \
+            list(range(n_notes))
+
+    @pytest.mark.parametrize("n_notes", [3, 4])
+    def test_tampered_content_rejected(self, evidence_system, n_notes):
+        """Conteúdo alterado invalida só a nota alterada"""
+        notes = evidence_system.create_evidence_batch(_contents(n_notes))
+        notes[1] = copy.deepcopy(notes[1])
+        notes[1]['content']['omega_score'] = 0.99
+
+        validity = [is_valid for is_valid, _ in
+                    evidence_system.verify_evidence_batch(notes)]
+        assert validity == [i != 1 for i in range(n_notes)]
+        assert not evidence_system.verify_evidence(notes[1])[0]
+
+    @pytest.mark.parametrize("tamper", ["sibling", "side", "root", "swap"])
+    def test_tampered_proof_rejected(self, evidence_system, tamper):
+        """Caminho, raiz ou prova de outra nota não verificam"""
+        notes = evidence_system.create_evidence_batch(_contents(5))
+        note = copy.deepcopy(notes[2])
+        proof = note['merkle_proof']
+
+        if tamper == "sibling":
+            proof['path'][0][0] = _merkle_leaf(b"forged").hex()
+        elif tamper == "side":
+            proof['path'][0][1] = 'L' if proof['path'][0][1] == 'R' else 'R'
+        elif tamper == "root":
+            proof['root'] = _merkle_leaf(b"forged").hex()
+        else:
+            note['merkle_proof'] = copy.deepcopy(notes[3]['merkle_proof'])
+
+        assert not evidence_system.verify_evidence(note)[0]
+        assert not evidence_system.verify_evidence_batch([note])[0][0]
+
+    def test_batch_matches_single_verification(self, evidence_system):
+        """verify_evidence_batch concorda com verify_evidence nota a nota"""
+        batch = evidence_system.create_evidence_batch(_contents(4))
+        other_batch = evidence_system.create_evidence_batch(_contents(3))
+        single = evidence_system.create_evidence({'audit': 'single'})
+
+        tampered = copy.deepcopy(batch[0])
+        tampered['content']['audit'] = -1
+        forged_single = copy.deepcopy(single)
+        forged_single['pqc_signature']['message_hash'] = \
+            other_batch[0]['pqc_signature']['message_hash']
+        unsigned = {'content': {'audit': 'unsigned'}}
+
+        notes = (batch + other_batch
+                 + [single, tampered, forged_single, unsigned, batch[1]])
+        expected = [evidence_system.verify_evidence(note) for note in notes]
+
+        assert evidence_system.verify_evidence_batch(notes) == expected
+        assert [is_valid for is_valid, _ in expected] == \
+            [True] * 8 + [False, False, False, True]
+
+
+# === TESTES ROTAÇÃO DE CHAVE ===
+
+class TestKeyRotation:
+    """Testes de substituição do keypair de um PQCEvidenceNote"""
+
+    def test_replaced_keypair_signs_new_notes(self):
+        """Notas novas usam a chave nova; as antigas continuam válidas"""
+        signer = SPHINCSPlusSigner()
+        evidence_system = PQCEvidenceNote(signer)
+        old_note = evidence_system.create_evidence({'audit': 'old'})
+
+        evidence_system.keypair = signer.generate_keypair()
+        new_note = evidence_system.create_evidence({'audit': 'new'})
+        batch = evidence_system.create_evidence_batch(_contents(2))
+
+        public_key = evidence_system.keypair.public_key
+        assert new_note['pqc_signature']['public_key'] == public_key
+        assert old_note['pqc_signature']['public_key'] != public_key
+        assert all(note['pqc_signature']['public_key'] == public_key
+                   for note in batch)
+        assert all(is_valid for is_valid, _ in
+                   evidence_system.verify_evidence_batch([old_note, new_note] + batch))
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Test Suite - Ω-GATE Integration
+
+Testes do OmegaGateProcessor:
+- Tiers do Ω-Score
+- Conteúdo assinado do Evidence Note
+- Auditoria completa (Kalman + PQC + Ω-GATE)
+
+Author: MatVerse Team
+Version: 1.0.0
+Date: 2025-11-22
+"""
+
+import copy
+import json
+import math
+import pickle
+import sys
+from pathlib import Path
+
+# Adiciona backend ao path
+backend_path = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_path))
+
+import pytest
+from src.integration.omega_gate_integration import (
+    OmegaGateProcessor,
+    _kalman_summary
+)
+
+
+# === FIXTURES ===
+
+@pytest.fixture(scope="module")
+def processor():
+    """Um OmegaGateProcessor (par de chaves PQC) para o módulo inteiro"""
+    return OmegaGateProcessor()
+
+
+# === TESTES TIERS ===
+
+class TestOmegaTier:
+    """Testes de _get_omega_tier"""
+
+    @pytest.mark.parametrize("omega_score,tier", [
+        (0.0, "REVISÃO NECESSÁRIA"),
+        (0.69, "REVISÃO NECESSÁRIA"),
+        (0.70, "APROVADO (Standard)"),
+        (0.85, "VERDADE¹ (Premium)"),
+        (0.95, "VERDADE² (Elite)"),
+        (1.0, "VERDADE² (Elite)"),
+    ])
+    def test_tier_bounds(self, processor, omega_score, tier):
+        """Limites inferiores dos tiers são inclusivos"""
+        assert processor._get_omega_tier(omega_score) == tier
+
+    def test_nan_is_lowest_tier(self, processor):
+        """Ω-Score NaN não é aprovado e cai no tier mais baixo"""
+        assert processor._get_omega_tier(float('nan')) == "REVISÃO NECESSÁRIA"
+
+    def test_nan_audit_not_elite(self, processor):
+        """Série com NaN gera auditoria reprovada no tier mais baixo"""
+        result = processor.process_comprehensive_audit(
+            [0.1, float('nan'), 0.5, 0.7, 0.9],
+            [-0.1, -0.3, -0.5, -0.7, -0.9]
+        )
+
+        omega_gate = result['omega_gate']
+        assert math.isnan(omega_gate['omega_score'])
+        assert omega_gate['approved'] is False
+        assert omega_gate['tier'] == "REVISÃO NECESSÁRIA"
+
+
+# === TESTES CONTEÚDO ASSINADO ===
+
+class TestEvidenceContent:
+    """Testes do conteúdo assinado de uma auditoria"""
+
+    KALMAN_RESULTS = {
+        'correlation_initial': -0.5,
+        'correlation_final': -0.97,
+        'correlation_gain': 0.47,
+        'fidelity': 0.93,
+        'coherence': 0.91,
+        'cfc_score': 0.94,
+        'iterations': 12,
+        'converged': True,
+        'processing_time_ms': 1.5
+    }
+
+    def _content(self, processor, summary):
+        return processor._build_evidence_content(
+            summary, 0.9, 0.93, 1.5, 0.09, {'run': 'test'}
+        )
+
+    def test_kalman_evidence_schema(self, processor):
+        """kalman_results assinado usa 'fidelity' e não carrega tempos"""
+        content = self._content(processor, _kalman_summary(self.KALMAN_RESULTS))
+
+        kalman_results = content['kalman_results']
+        assert kalman_results['fidelity'] == 0.93
+        assert 'fidelity_new' not in kalman_results
+        assert 'processing_time_ms' not in kalman_results
+        assert content['processing_time_ms'] == 1.5
+
+    def test_result_mutation_does_not_touch_signed_content(self, processor):
+        """O resumo do resultado e o conteúdo assinado são dicts distintos"""
+        summary = _kalman_summary(self.KALMAN_RESULTS)
+        content = self._content(processor, summary)
+        note = processor.evidence_system.create_evidence(content)
+
+        summary['converged'] = False
+        summary['fidelity_new'] = 0.0
+
+        assert note['content']['kalman_results']['converged'] is True
+        assert processor.evidence_system.verify_evidence(note)[0]
+
+    def test_signed_note_is_plain_data(self, processor):
+        """Notas assinadas serializam em JSON, copiam e picklam"""
+        content = self._content(processor, _kalman_summary(self.KALMAN_RESULTS))
+        notes = [processor.evidence_system.create_evidence(content)]
+        notes += processor.process_batch_signed([content, content])
+
+        for note in notes:
+            assert json.loads(json.dumps(note)) == note
+            assert copy.deepcopy(note) == note
+            assert pickle.loads(pickle.dumps(note)) == note
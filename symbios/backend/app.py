@@ -1,4 +1,5 @@
-from fastapi import FastAPI
+from fastapi import BackgroundTasks, FastAPI
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 
 from symbios.backend.omega_gate import omega_gate
@@ -16,16 +17,18 @@ app = FastAPI(title="SymbiOS Ω-GATE + PoSE-Lite MVP")
 
 
 @app.post("/symbios/ia/invoke")
-def invoke_ia(req: Request):
+def invoke_ia(req: Request, background_tasks: BackgroundTasks):
     """Invoke the Omega Gate and optionally record evidence."""
 
     request_payload = req.model_dump()
     gate_result = omega_gate(request_payload)
 
     if gate_result["approved"]:
-        register_evidence(request_payload, gate_result)
+        # Evidence is written after the response is sent, off the request's latency path
+        background_tasks.add_task(register_evidence, request_payload, gate_result)
 
-    return gate_result
+    # gate_result holds only JSON-native values: skip the jsonable_encoder pass
+    return JSONResponse(gate_result)
 
 
 @app.get("/")
@@ -1,38 +1,79 @@
 from __future__ import annotations
 
 import json
-from typing import Any, Dict, Mapping, MutableMapping
+from collections.abc import Mapping
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 TAU = 0.85
+SUBSCORE_WEIGHT = 0.25  # Ψ weight of each of the four subscores
+BANNED_TERMS = ("violation", "malware", "exploit")
+SUBSCORE_CACHE_MAX_TEXT = 4096  # longer outputs are scored without being kept in the cache
 
 
 def compute_subscores(s: Mapping[str, Any]) -> Dict[str, float]:
-    # Preserve separation between input/output/context even if malformed payloads arrive
-    output_payload = s.get("output") if isinstance(s, Mapping) else {}
-    input_payload: MutableMapping[str, Any] = s.get("input") if isinstance(s, Mapping) else {}
-    context_payload = s.get("context") if isinstance(s, Mapping) else {}
+    # Preserve separation between input/output/context even if malformed payloads arrive:
+    # each section is coerced once here, so the scorer below only sees str/tuple values
+    if not _is_mapping(s):
+        s = {}
+    output_payload = s.get("output")
+    input_payload = s.get("input")
+    context_payload = s.get("context")
+
+    output_text = str(output_payload.get("text", "")) if _is_mapping(output_payload) else ""
+    input_keys = tuple(map(str, input_payload)) if _is_mapping(input_payload) else ()
+    expected_format = context_payload.get("expected_format") if _is_mapping(context_payload) else None
+    # Falsy hints ("", [], {}) mean "no format hint" and must not reach the cache key unhashed
+    expected_format = expected_format or None
+
+    score = _subscores_cached if len(output_text) <= SUBSCORE_CACHE_MAX_TEXT else _subscores_core
+    format_score, policy_score, consistency, coverage = score(output_text, input_keys, expected_format)
+    return {
+        "format": format_score,
+        "policy": policy_score,
+        "consistency": consistency,
+        "coverage": coverage,
+    }
 
-    output_text = ""
-    if isinstance(output_payload, Mapping):
-        output_text = str(output_payload.get("text", ""))
 
-    if not isinstance(input_payload, Mapping):
-        input_payload = {}
+def _is_mapping(value: Any) -> bool:
+    # Exact-dict check first: the ABC isinstance is several times slower and payloads are dicts
+    return type(value) is dict or isinstance(value, Mapping)
 
-    if not isinstance(context_payload, Mapping):
-        context_payload = {}
 
-    return {
-        "format": 1.0 if _is_json(output_text) else 0.0,
-        "policy": 1.0 if not _violates_policy(output_text) else 0.0,
-        "consistency": _heuristic_consistency(output_text),
-        "coverage": _heuristic_coverage(input_payload, output_text, context_payload),
-    }
+def _subscores_core(
+    output_text: str, input_keys: Tuple[str, ...], expected_format: Optional[str]
+) -> Tuple[float, float, float, float]:
+    # Pure in its arguments, so replayed/A-B requests can skip all the text scans
+    lowered = output_text.lower()  # one lowered copy shared by policy and coverage
+    return (
+        1.0 if _is_json(output_text) else 0.0,
+        1.0 if not _violates_policy(lowered) else 0.0,
+        _heuristic_consistency(output_text),
+        _heuristic_coverage(input_keys, output_text, expected_format, lowered),
+    )
+
+
+# Memoized scorer for outputs up to SUBSCORE_CACHE_MAX_TEXT chars (bounds the cache's memory)
+_subscores_cached = lru_cache(maxsize=1024)(_subscores_core)
 
 
 def compute_psi(subscores: Dict[str, float]) -> float:
-    weights = {"format": 0.25, "policy": 0.25, "consistency": 0.25, "coverage": 0.25}
-    return sum(weights.get(k, 0.0) * v for k, v in subscores.items())
+    # Unrolled over the fixed keys; unknown keys are ignored, missing ones count as 0
+    get = subscores.get
+    return (
+        SUBSCORE_WEIGHT * get("format", 0.0)
+        + SUBSCORE_WEIGHT * get("policy", 0.0)
+        + SUBSCORE_WEIGHT * get("consistency", 0.0)
+        + SUBSCORE_WEIGHT * get("coverage", 0.0)
+    )
 
 
 def omega_gate(s: Dict[str, Any]) -> Dict[str, Any]:
@@ -52,6 +93,15 @@ def _is_json(text: str) -> bool:
         return False
 
     if text.startswith("{") or text.startswith("["):
+        # An object/array must end with its matching closer: reject without parsing
+        if text[-1] != ("}" if text[0] == "{" else "]"):
+            return False
+        if ORJSON_AVAILABLE:
+            try:
+                orjson.loads(text)
+                return True
+            except orjson.JSONDecodeError:
+                pass  # stricter than json (NaN, >64-bit ints): let json decide
         try:
             json.loads(text)
             return True
@@ -60,10 +110,9 @@ def _is_json(text: str) -> bool:
     return False
 
 
-def _violates_policy(text: str) -> bool:
-    banned_terms = ["violation", "malware", "exploit"]
-    lowered = text.lower()
-    return any(term in lowered for term in banned_terms)
+def _violates_policy(lowered: str) -> bool:
+    # Takes text.lower(): C substring search on it beats an IGNORECASE alternation regex
+    return any(term in lowered for term in BANNED_TERMS)
 
 
 def _heuristic_consistency(text: str) -> float:
@@ -80,14 +129,15 @@ def _heuristic_consistency(text: str) -> float:
     return max(0.0, 1.0 - formatting_penalty) * punctuation_balance
 
 
-def _heuristic_coverage(inp: Dict[str, Any], out: str, ctx: Dict[str, Any]) -> float:
-    expected_format = ctx.get("expected_format")
-    mentioned_keys = sum(1 for key in inp.keys() if str(key) in out)
-    key_coverage = mentioned_keys / max(len(inp), 1)
+def _heuristic_coverage(
+    input_keys: Tuple[str, ...], out: str, expected_format: Optional[str], lowered_out: str
+) -> float:
+    mentioned_keys = sum(1 for key in input_keys if key in out)
+    key_coverage = mentioned_keys / max(len(input_keys), 1)
 
     if expected_format:
         format_hint = expected_format.lower()
-        format_present = format_hint in out.lower()
+        format_present = format_hint in lowered_out
     else:
         format_present = True
 
@@ -2,25 +2,112 @@ from __future__ import annotations
 
 import hashlib
 import json
-import uuid
+import os
+import threading
+from collections import deque
+from concurrent.futures import Future
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple
 
 BASE_DIR = Path(__file__).resolve().parents[1]
 LOG_PATH = BASE_DIR / "evidence.json"
 LOCAL_LOG = BASE_DIR / "pose_log.txt"
 
+# How json.dumps(list, indent=2) + "\n" ends a non-empty array
+_ARRAY_TAIL = b"\n]\n"
+
+# Serializes log writes: sync FastAPI endpoints run in a thread pool
+_LOG_LOCK = threading.Lock()
+
+# Serialized (record, array item, envelope line, outcome) waiting for whichever writer
+# holds _LOG_LOCK next; that writer flushes every pending record in one batch and
+# resolves each record's outcome, so every caller sees the result of its own write
+_PendingRecord = Tuple[Dict[str, Any], str, bytes, "Future[None]"]
+_pending: Deque[_PendingRecord] = deque()
+
+# (path, fd) of the append-only LOCAL_LOG descriptor, reused until the file is
+# repointed, rotated or deleted
+_local_log_fd: Optional[Tuple[Path, int]] = None
+
+
+# Built once: json.dumps with non-default options constructs a new encoder per call
+_CANONICAL_ENCODER = json.JSONEncoder(sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
 
 def canonical_serialize(data: Dict[str, Any]) -> bytes:
-    return json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    return _CANONICAL_ENCODER.encode(data).encode("utf-8")
+
+
+def _new_evidence_id() -> str:
+    """Random RFC 4122 version-4 UUID string, formatted without building a uuid.UUID."""
+    raw = bytearray(os.urandom(16))
+    raw[6] = (raw[6] & 0x0F) | 0x40  # version 4
+    raw[8] = (raw[8] & 0x3F) | 0x80  # RFC 4122 variant
+    h = raw.hex()
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
+
+def _array_item(record: Dict[str, Any]) -> str:
+    """A record as it appears inside the evidence array of ``json.dumps(..., indent=2)``."""
+    return json.dumps(record, indent=2, ensure_ascii=False).replace("\n", "\n  ")
+
+
+def _append_to_log(items: Sequence[str]) -> bool:
+    """Append array items to the evidence array in place, touching only the file tail.
+
+    Writes the same bytes a full ``json.dumps(..., indent=2)`` rewrite would. Returns
+    False when LOG_PATH is missing or does not end like a non-empty array, so the
+    caller can fall back to rewriting the whole file.
+    """
+    try:
+        with LOG_PATH.open("r+b") as log_file:
+            tail_offset = log_file.seek(0, os.SEEK_END) - len(_ARRAY_TAIL)
+            if tail_offset <= 0:
+                return False
+            log_file.seek(tail_offset)
+            if log_file.read() != _ARRAY_TAIL:
+                return False
+
+            log_file.seek(tail_offset)
+            log_file.write((",\n  " + ",\n  ".join(items) + "\n]\n").encode("utf-8"))
+            return True
+    except FileNotFoundError:
+        return False
+
+
+def _is_open_local_log(path: Path, fd: int) -> bool:
+    """Whether fd is still the file currently at LOCAL_LOG."""
+    if path != LOCAL_LOG:
+        return False
+    try:
+        on_disk = os.stat(LOCAL_LOG)
+    except FileNotFoundError:
+        return False
+    opened = os.fstat(fd)
+    return (on_disk.st_ino, on_disk.st_dev) == (opened.st_ino, opened.st_dev)
+
+
+def _append_local_log(line: bytes) -> None:
+    """Append line(s) to LOCAL_LOG with a single write on a long-lived O_APPEND fd.
+
+    Must be called with _LOG_LOCK held. Reopens if LOCAL_LOG was repointed, or if the
+    file at that path is missing or no longer the open one (rotated or deleted).
+    """
+    global _local_log_fd
+    if _local_log_fd is None or not _is_open_local_log(*_local_log_fd):
+        if _local_log_fd is not None:
+            os.close(_local_log_fd[1])
+        fd = os.open(LOCAL_LOG, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        _local_log_fd = (LOCAL_LOG, fd)
+    os.write(_local_log_fd[1], line)
 
 
 def register_evidence(s: Dict[str, Any], gate_result: Dict[str, Any]) -> None:
     LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
 
     entry = {
-        "id": str(uuid.uuid4()),
+        "id": _new_evidence_id(),
         "timestamp": datetime.now(timezone.utc).isoformat(),
         "model": s.get("model"),
         "input": s.get("input", {}),
@@ -38,17 +125,60 @@ def register_evidence(s: Dict[str, Any], gate_result: Dict[str, Any]) -> None:
         "timestamp": entry["timestamp"],
     }
 
-    existing_evidence: list[Dict[str, Any]] = []
-    if LOG_PATH.exists():
+    record = {"D": entry, "H": evidence_hash, "E": envelope}
+    envelope_line = (json.dumps(envelope, ensure_ascii=False) + "\n").encode("utf-8")
+    outcome: Future[None] = Future()
+    _pending.append((record, _array_item(record), envelope_line, outcome))
+
+    with _LOG_LOCK:
+        # Already resolved if a concurrent writer flushed this record along with its own
+        if not outcome.done():
+            _flush_pending()
+
+    # Re-raises the write error of the batch this record was flushed in
+    outcome.result()
+
+
+def _flush_pending() -> None:
+    """Write every pending record with one evidence append and one pose_log write.
+
+    Must be called with _LOG_LOCK held. Never raises: the outcome of every record in
+    the batch is set to the write error instead, and each caller re-raises it.
+    """
+    batch: List[_PendingRecord] = []
+    while _pending:
+        batch.append(_pending.popleft())
+    if not batch:
+        return
+
+    records, items, envelope_lines, outcomes = zip(*batch)
+    try:
+        _write_batch(records, items, envelope_lines)
+    except BaseException as exc:
+        for outcome in outcomes:
+            outcome.set_exception(exc)
+    else:
+        for outcome in outcomes:
+            outcome.set_result(None)
+
+
+def _write_batch(
+    records: Sequence[Dict[str, Any]], items: Sequence[str], envelope_lines: Sequence[bytes]
+) -> None:
+    """Append a batch to evidence.json and pose_log.txt. Must be called with _LOG_LOCK held."""
+
+    # Fast path: O(batch) append; the full read/rewrite only creates or repairs the file
+    if not _append_to_log(items):
+        existing_evidence: list[Dict[str, Any]] = []
         try:
-            existing_evidence = json.loads(LOG_PATH.read_text(encoding="utf-8"))
+            with LOG_PATH.open("rb") as log_file:
+                existing_evidence = json.loads(log_file.read())
             if not isinstance(existing_evidence, list):
                 existing_evidence = []
-        except json.JSONDecodeError:
+        except (FileNotFoundError, json.JSONDecodeError, UnicodeDecodeError):
             existing_evidence = []
 
-    existing_evidence.append({"D": entry, "H": evidence_hash, "E": envelope})
-    LOG_PATH.write_text(json.dumps(existing_evidence, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+        existing_evidence.extend(records)
+        LOG_PATH.write_text(json.dumps(existing_evidence, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
 
-    with LOCAL_LOG.open("a", encoding="utf-8") as log_file:
-        log_file.write(json.dumps(envelope, ensure_ascii=False) + "\n")
+    _append_local_log(b"".join(envelope_lines))
@@ -1,30 +1,40 @@
 import json
-import time
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 from typing import Any, Dict
 
 import requests
+from requests.adapters import HTTPAdapter
 
 URL = "http://localhost:8000/symbios/ia/invoke"
+REQUESTS = 5
+WORKERS = 4
 
 
-def run_fake_request(index: int) -> Dict[str, Any]:
+def make_session(pool_maxsize: int = WORKERS) -> requests.Session:
+    """Keep-alive session so every request reuses the pooled connection to URL."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize, max_retries=0)
+    session.mount(URL.split("://", 1)[0] + "://", adapter)
+    return session
+
+
+def run_fake_request(session: requests.Session, index: int) -> Dict[str, Any]:
     payload = {
         "model": "gpt-4o",
         "input": {"prompt": f"Responda a pergunta {index}"},
         "output": {"text": f"Resposta simulada {index}", "tokens": 10 + index},
-        "context": {"expected_format": "text", "timestamp": datetime.utcnow().isoformat()},
+        "context": {"expected_format": "text", "timestamp": datetime.now(timezone.utc).isoformat()},
     }
-    response = requests.post(URL, json=payload, timeout=10)
+    response = session.post(URL, json=payload, timeout=10)
     response.raise_for_status()
     return response.json()
 
 
 def main() -> None:
-    results = []
-    for i in range(5):
-        results.append(run_fake_request(i))
-        time.sleep(0.5)
+    # Requests overlap across WORKERS pooled connections; map() keeps results in index order
+    with make_session() as session, ThreadPoolExecutor(max_workers=WORKERS) as pool:
+        results = list(pool.map(lambda i: run_fake_request(session, i), range(REQUESTS)))
 
     print(json.dumps(results, indent=2, ensure_ascii=False))
     print("Bench finalizado. Verifique evidence.json e pose_log.txt.")
@@ -0,0 +1,170 @@
+"""
+Tests for the PoSE-Lite evidence log: batched flushes, tail appends and pose_log rotation
+"""
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Add repository root to path
+repo_root = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(repo_root))
+
+from symbios.backend import pose_lite
+
+
+@pytest.fixture
+def logs(tmp_path, monkeypatch):
+    """Point LOG_PATH and LOCAL_LOG at tmp_path and close the pose_log fd afterwards"""
+    monkeypatch.setattr(pose_lite, "LOG_PATH", tmp_path / "evidence.json")
+    monkeypatch.setattr(pose_lite, "LOCAL_LOG", tmp_path / "pose_log.txt")
+    yield tmp_path / "evidence.json", tmp_path / "pose_log.txt"
+
+    if pose_lite._local_log_fd is not None:
+        os.close(pose_lite._local_log_fd[1])
+        pose_lite._local_log_fd = None
+
+
+def _register(i):
+    pose_lite.register_evidence({"model": "m", "input": {"i": i}}, {"omega": 0.9})
+
+
+def _evidence(log_path):
+    return json.loads(log_path.read_text(encoding="utf-8"))
+
+
+def _envelopes(local_log):
+    return [json.loads(line) for line in local_log.read_text(encoding="utf-8").splitlines()]
+
+
+def _assert_consistent(log_path, local_log):
+    """evidence.json equals a full indent=2 rewrite and pose_log follows the same order"""
+    evidence = _evidence(log_path)
+    assert log_path.read_text(encoding="utf-8") == json.dumps(evidence, indent=2, ensure_ascii=False) + "\n"
+    assert [record["E"] for record in evidence] == _envelopes(local_log)
+    return evidence
+
+
+def _start_blocked_writers(n, target):
+    """Start n writer threads while holding _LOG_LOCK, so all of them land in one batch"""
+    threads = [threading.Thread(target=target, args=(i,)) for i in range(n)]
+    with pose_lite._LOG_LOCK:
+        for thread in threads:
+            thread.start()
+        deadline = time.monotonic() + 5.0
+        while len(pose_lite._pending) < n and time.monotonic() < deadline:
+            time.sleep(0.001)
+        assert len(pose_lite._pending) == n
+    for thread in threads:
+        thread.join(timeout=5.0)
+    return threads
+
+
+def test_sequential_appends_match_full_rewrite(logs):
+    log_path, local_log = logs
+    for i in range(5):
+        _register(i)
+
+    evidence = _assert_consistent(log_path, local_log)
+    assert [record["D"]["input"]["i"] for record in evidence] == list(range(5))
+    for record in evidence:
+        assert record["H"] == record["E"]["hash"]
+
+
+@pytest.mark.parametrize("initial", ["[]\n", "", "{not json", '{"a": 1}\n'])
+def test_unappendable_log_falls_back_to_rewrite(logs, initial):
+    log_path, local_log = logs
+    log_path.write_text(initial, encoding="utf-8")
+
+    _register(0)
+    _register(1)
+
+    evidence = _assert_consistent(log_path, local_log)
+    assert [record["D"]["input"]["i"] for record in evidence] == [0, 1]
+
+
+def test_concurrent_writers(logs):
+    log_path, local_log = logs
+
+    def worker(k):
+        for j in range(50):
+            _register(k * 50 + j)
+
+    threads = [threading.Thread(target=worker, args=(k,)) for k in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    evidence = _assert_consistent(log_path, local_log)
+    assert sorted(record["D"]["input"]["i"] for record in evidence) == list(range(400))
+    assert not pose_lite._pending
+
+
+def test_blocked_writers_flush_in_one_batch(logs, monkeypatch):
+    log_path, local_log = logs
+    batch_sizes = []
+    write_batch = pose_lite._write_batch
+
+    def counting_write_batch(records, items, envelope_lines):
+        batch_sizes.append(len(records))
+        write_batch(records, items, envelope_lines)
+
+    monkeypatch.setattr(pose_lite, "_write_batch", counting_write_batch)
+    _start_blocked_writers(6, _register)
+
+    assert batch_sizes == [6]
+    assert len(_assert_consistent(log_path, local_log)) == 6
+
+
+def test_write_error_raised_to_every_caller_in_batch(logs, monkeypatch):
+    log_path, local_log = logs
+    _register(-1)
+
+    def failing_append(line):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(pose_lite, "_append_local_log", failing_append)
+    errors = []
+
+    def writer(i):
+        try:
+            _register(i)
+        except OSError as exc:
+            errors.append(exc)
+
+    _start_blocked_writers(5, writer)
+
+    assert len(errors) == 5
+    assert all(str(exc) == "disk full" for exc in errors)
+    assert not pose_lite._pending
+
+    # The log keeps working once the failure clears
+    monkeypatch.undo()
+    monkeypatch.setattr(pose_lite, "LOG_PATH", log_path)
+    monkeypatch.setattr(pose_lite, "LOCAL_LOG", local_log)
+    _register(99)
+    assert _envelopes(local_log)[-1]["id"] == _evidence(log_path)[-1]["E"]["id"]
+
+
+def test_pose_log_reopened_after_rotate_and_delete(logs):
+    log_path, local_log = logs
+    _register(0)
+
+    rotated = local_log.with_name("pose_log.txt.1")
+    os.rename(local_log, rotated)
+    _register(1)
+
+    assert len(_envelopes(rotated)) == 1
+    assert len(_envelopes(local_log)) == 1
+
+    os.remove(local_log)
+    _register(2)
+    _register(3)
+
+    envelopes = _envelopes(local_log)
+    assert [envelope["id"] for envelope in envelopes] == [record["E"]["id"] for record in _evidence(log_path)[2:]]